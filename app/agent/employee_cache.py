@@ -0,0 +1,153 @@
+import os
+import threading
+from typing import Any, Dict, NamedTuple, Optional
+
+from cachetools import TTLCache
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.employee import Employee
+
+# ------------------------------------------------------------------
+# Employee read cache
+# ------------------------------------------------------------------
+#
+# Login and profile views look up the same employees turn after turn.
+# Those reads, and GETs on the /employee API, are served from a
+# process-wide LRU of row snapshots (never ORM instances, so no Session
+# is kept alive and nothing cached can be flushed by accident).
+#
+# Writes still load the employee from their own session. Every write
+# path calls invalidate_employee(); the TTL bounds staleness for writes
+# made by other processes.
+
+EMPLOYEE_CACHE_SIZE = int(os.getenv("EMPLOYEE_CACHE_SIZE", "512"))
+EMPLOYEE_CACHE_TTL = float(os.getenv("EMPLOYEE_CACHE_TTL", "30"))
+
+_cache = TTLCache(maxsize=EMPLOYEE_CACHE_SIZE, ttl=EMPLOYEE_CACHE_TTL)
+_cache_lock = threading.Lock()
+
+# id -> email of every row ever cached, kept outside the LRU: an id-only
+# invalidation must still find the ("email", ...) entry after eviction
+# or expiry dropped the ("id", ...) one. Bounded by the employee count.
+_email_by_id: Dict[int, str] = {}
+
+
+class EmployeeRow(NamedTuple):
+    id: int
+    name: str
+    email: str
+    role: str
+    location: Optional[str]
+    status: str
+
+
+# Only the columns a snapshot needs; salary etc. are never fetched
+_BY_EMAIL = select(
+    Employee.id,
+    Employee.name,
+    Employee.email,
+    Employee.role,
+    Employee.location,
+    Employee.status,
+)
+
+
+def _snapshot(emp: Employee) -> EmployeeRow:
+    return EmployeeRow(
+        emp.id, emp.name, emp.email, emp.role, emp.location, emp.status
+    )
+
+
+def _remember(row: EmployeeRow):
+    with _cache_lock:
+        _cache[("id", row.id)] = row
+        _cache[("email", row.email)] = row
+        _email_by_id[row.id] = row.email
+
+
+def get_employee_by_email(db: Session, email: str) -> Optional[EmployeeRow]:
+    with _cache_lock:
+        row = _cache.get(("email", email))
+    if row is not None:
+        return row
+
+    found = db.execute(_BY_EMAIL.where(Employee.email == email)).first()
+    if found is None:
+        return None  # misses are not cached
+
+    row = EmployeeRow(*found)
+    _remember(row)
+    return row
+
+
+def get_employee_by_id(db: Session, emp_id: int) -> Optional[EmployeeRow]:
+    with _cache_lock:
+        row = _cache.get(("id", emp_id))
+    if row is not None:
+        return row
+
+    emp = db.get(Employee, emp_id)
+    if not emp:
+        return None
+
+    row = _snapshot(emp)
+    _remember(row)
+    return row
+
+
+_RECORD_COLUMNS = tuple(c.name for c in Employee.__table__.columns)
+
+
+def peek_employee_record(emp_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Cached full record for an employee, or None. Never touches the DB,
+    so async callers can use it without leaving the event loop.
+    """
+    with _cache_lock:
+        record = _cache.get(("record", emp_id))
+    return None if record is None else dict(record)
+
+
+def get_employee_record(db: Session, emp_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Full column dict for an employee (the /employee API response body).
+    """
+    with _cache_lock:
+        record = _cache.get(("record", emp_id))
+    if record is None:
+        emp = db.get(Employee, emp_id)
+        if not emp:
+            return None
+        record = {name: getattr(emp, name) for name in _RECORD_COLUMNS}
+        with _cache_lock:
+            _cache[("record", emp_id)] = record
+    return dict(record)  # callers get a copy; the cached dict stays pristine
+
+
+def clear_employee_cache():
+    """
+    Drop every cached row, e.g. after the whole table is restored.
+    """
+    with _cache_lock:
+        _cache.clear()
+        _email_by_id.clear()
+
+
+def invalidate_employee(emp_id: Optional[int] = None, email: Optional[str] = None):
+    """
+    Drop cached rows for an employee after it is created, updated or deleted.
+    """
+    with _cache_lock:
+        if emp_id is not None:
+            _cache.pop(("record", emp_id), None)
+            _cache.pop(("id", emp_id), None)
+            cached_email = _email_by_id.pop(emp_id, None)
+            if cached_email is not None:
+                _cache.pop(("email", cached_email), None)
+        if email is not None:
+            row = _cache.pop(("email", email), None)
+            if row is not None:
+                _cache.pop(("id", row.id), None)
+                _cache.pop(("record", row.id), None)
+                _email_by_id.pop(row.id, None)
@@ -1,7 +1,7 @@
-from langgraph.graph import StateGraph, END
+from langgraph.graph import StateGraph, START, END
 
 from app.agent.state import AgentState
-from app.agent.nodes.intent import extract_intent
+from app.agent.nodes.intent import extract_intent, load_candidates
 from app.agent.nodes.decision import decide_action
 from app.agent.nodes.authorize import authorize_action
 from app.agent.nodes.hitl import handle_hitl
@@ -13,17 +13,17 @@ def build_agent_graph():
     Build and compile the LangGraph agent.
 
     Execution flow:
-        intent
-          ↓
-        decision
-          ↓
-        authorize
-          ↓
-        hitl
-          ↓
-        execute
-          ↓
-         END
+        intent   load_candidates   (run concurrently)
+             ↘   ↙
+            decision
+               ↓
+            authorize
+               ↓
+              hitl
+               ↓
+            execute
+               ↓
+              END
     """
 
     graph = StateGraph(AgentState)
@@ -33,6 +33,7 @@ def build_agent_graph():
     # ------------------------------------------------------------
 
     graph.add_node("intent", extract_intent)
+    graph.add_node("load_candidates", load_candidates)
     graph.add_node("decision", decide_action)
     graph.add_node("authorize", authorize_action)
     graph.add_node("hitl", handle_hitl)
@@ -42,19 +43,24 @@ def build_agent_graph():
     # Entry point
     # ------------------------------------------------------------
 
-    graph.set_entry_point("intent")
+    # Fan out: classification and name resolution are independent
+    graph.add_edge(START, "intent")
+    graph.add_edge(START, "load_candidates")
 
     # ------------------------------------------------------------
     # Edges
     # ------------------------------------------------------------
 
-    graph.add_edge("intent", "decision")
+    # Join: decision waits for both branches
+    graph.add_edge(["intent", "load_candidates"], "decision")
     graph.add_edge("decision", "authorize")
     graph.add_edge("authorize", "hitl")
     graph.add_edge("hitl", "execute")
     graph.add_edge("execute", END)
 
-    return graph.compile()
+    # No checkpointer: session state is persisted by the API layer, so
+    # nothing needs to be snapshotted between nodes
+    return graph.compile(checkpointer=None)
 
 
 # ------------------------------------------------------------------
@@ -0,0 +1,90 @@
+import os
+import time
+import threading
+from typing import Optional
+
+import ahocorasick
+
+from app.database import SessionLocal
+from app.models.employee import Employee
+
+# ------------------------------------------------------------------
+# Employee name matcher
+# ------------------------------------------------------------------
+#
+# A process-wide Aho-Corasick automaton over lowercased employee names.
+# Resolving a name from user input is a single walk over the input
+# instead of loading every employee and substring-testing each name.
+#
+# The automaton is rebuilt when it is older than NAME_INDEX_TTL seconds
+# or after invalidate_name_index() is called by a write path.
+
+NAME_INDEX_TTL = float(os.getenv("NAME_INDEX_TTL", "60"))
+
+_AC = {"automaton": None, "id_by_name": {}, "loaded_at": 0.0}
+_AC_LOCK = threading.Lock()
+
+
+def invalidate_name_index():
+    """
+    Force the next lookup to rebuild the automaton.
+    Call after employees are created, renamed or deleted.
+    """
+    _AC["loaded_at"] = 0.0
+
+
+def _is_fresh() -> bool:
+    return _AC["automaton"] is not None and (
+        time.monotonic() - _AC["loaded_at"] < NAME_INDEX_TTL
+    )
+
+
+def _get_automaton():
+    if _is_fresh():
+        return _AC["automaton"]
+
+    # Only one thread rebuilds; the others wait and reuse its result
+    with _AC_LOCK:
+        if _is_fresh():
+            return _AC["automaton"]
+        return _rebuild_automaton()
+
+
+def _rebuild_automaton():
+    db = SessionLocal()
+    try:
+        rows = db.query(Employee.id, Employee.name).all()
+    finally:
+        db.close()
+
+    automaton = ahocorasick.Automaton()
+    id_by_name = {}
+    for emp_id, name in rows:
+        name_lc = name.lower()
+        # First employee wins on duplicate names (matches previous scan order)
+        if name_lc not in id_by_name:
+            id_by_name[name_lc] = emp_id
+            automaton.add_word(name_lc, (emp_id, name_lc))
+
+    if id_by_name:
+        automaton.make_automaton()
+
+    _AC["automaton"] = automaton
+    _AC["id_by_name"] = id_by_name
+    _AC["loaded_at"] = time.monotonic()
+    return automaton
+
+
+def resolve_employee_id(user_input: str) -> Optional[int]:
+    """
+    Return the id of the first employee whose name appears in
+    `user_input` (expected to be lowercased), or None.
+    """
+    automaton = _get_automaton()
+    if not _AC["id_by_name"]:
+        return None
+
+    for _, (emp_id, _) in automaton.iter(user_input):
+        return emp_id
+
+    return None
@@ -1,8 +1,32 @@
+from typing import Any, Dict
+
 from app.agent.state import AgentState
 from app.logging.audit import log_event
 
 
-def authorize_action(state: AgentState) -> AgentState:
+# ------------------------------------------------------------------
+# Policy
+# ------------------------------------------------------------------
+
+# Actions allowed before authentication
+_PREAUTH = frozenset({"login", "authenticate", "onboard_user"})
+
+# Allowed actions per role (None = full access)
+_ROLE_ACL = {
+    "employee": frozenset({"get_my_profile"}),
+    "manager": frozenset({"get_my_profile", "get_employee"}),  # read-only
+    "hr": None,
+}
+
+_DENY_REASON = {
+    "employee": "Employees may only view their own profile",
+    "manager": "Managers have read-only access",
+}
+
+_MISSING = object()
+
+
+def authorize_action(state: AgentState) -> Dict[str, Any]:
     """
     Authorization gate for agent actions.
 
@@ -10,6 +34,8 @@ def authorize_action(state: AgentState) -> AgentState:
     - Authorization is enforced ONLY when an action is selected
     - Login and onboarding are allowed pre-auth
     - RBAC is enforced strictly on `selected_api`
+
+    Pure check: returns an empty patch when allowed, raises otherwise.
     """
 
     session_id = state.session_id
@@ -20,85 +46,31 @@ def authorize_action(state: AgentState) -> AgentState:
     # 1. No action selected yet → nothing to authorize
     # --------------------------------------------------
     if action is None:
-        return state
-
-    # --------------------------------------------------
-    # 2. Allow pre-auth flows
-    # --------------------------------------------------
-    if action in ("login", "authenticate", "onboard_user"):
-        log_event(
-            "authorization_allow",
-            session_id,
-            {"action": action, "reason": "pre-auth flow"},
-        )
-        return state
+        return {}
 
     # --------------------------------------------------
-    # 3. Must be authenticated for everything else
+    # 2. Decide
     # --------------------------------------------------
-    if not state.authenticated:
-        log_event(
-            "authorization_deny",
-            session_id,
+    if action in _PREAUTH:
+        allowed, details, reason = True, {"action": action, "reason": "pre-auth flow"}, None
+    elif not state.authenticated:
+        allowed, details, reason = (
+            False,
             {"action": action, "reason": "unauthenticated"},
+            "User not authenticated",
         )
-        raise PermissionError("User not authenticated")
+    else:
+        acl = _ROLE_ACL.get(role, _MISSING)
+        allowed = acl is not _MISSING and (acl is None or action in acl)
+        details = {"role": role, "action": action}
+        reason = _DENY_REASON.get(role, "Unknown role")
 
     # --------------------------------------------------
-    # 4. Employee permissions
+    # 3. Log once and enforce
     # --------------------------------------------------
-    if role == "employee":
-        if action == "get_my_profile":
-            log_event(
-                "authorization_allow",
-                session_id,
-                {"role": role, "action": action},
-            )
-            return state
-
-        log_event(
-            "authorization_deny",
-            session_id,
-            {"role": role, "action": action},
-        )
-        raise PermissionError("Employees may only view their own profile")
-
-    # --------------------------------------------------
-    # 5. Manager permissions (read-only)
-    # --------------------------------------------------
-    if role == "manager":
-        if action in ("get_my_profile", "get_employee"):
-            log_event(
-                "authorization_allow",
-                session_id,
-                {"role": role, "action": action},
-            )
-            return state
-
-        log_event(
-            "authorization_deny",
-            session_id,
-            {"role": role, "action": action},
-        )
-        raise PermissionError("Managers have read-only access")
+    if allowed:
+        log_event("authorization_allow", session_id, details)
+        return {}
 
-    # --------------------------------------------------
-    # 6. HR permissions (full access)
-    # --------------------------------------------------
-    if role == "hr":
-        log_event(
-            "authorization_allow",
-            session_id,
-            {"role": role, "action": action},
-        )
-        return state
-
-    # --------------------------------------------------
-    # 7. Unknown role
-    # --------------------------------------------------
-    log_event(
-        "authorization_deny",
-        session_id,
-        {"role": role, "action": action},
-    )
-    raise PermissionError("Unknown role")
+    log_event("authorization_deny", session_id, details)
+    raise PermissionError(reason)
@@ -1,190 +1,177 @@
+from typing import Any, Callable, Dict
+
 from app.agent.state import AgentState
-from app.database import SessionLocal
-from app.models.employee import Employee
 from app.logging.audit import log_event
 
 
-def decide_action(state: AgentState) -> AgentState:
-    """
-    Decide which backend API to invoke and populate api_args.
+# ------------------------------------------------------------
+# Intent handlers
+#
+# Handlers never mutate `state`; they return the fields to update
+# and LangGraph merges the patch into the state.
+# ------------------------------------------------------------
 
-    HARD RULES:
-    - NEVER mutate authentication or role
-    - NEVER infer privilege
-    - NEVER silently fall back for destructive actions
-    - ALWAYS log decisions
-    """
+def _handle_blocked(state: AgentState, user_input: str) -> Dict[str, Any]:
+    log_event(
+        "decision_blocked",
+        state.session_id,
+        {"reason": "guardrail_intervention"},
+    )
+    return {
+        "selected_api": None,
+        "response": "Your request was blocked due to policy violations.",
+    }
 
-    user_input = (state.user_input or "").lower().strip()
-    intent = state.intent
 
+def _handle_authenticate(state: AgentState, user_input: str) -> Dict[str, Any]:
     log_event(
-        "decision_start",
+        "decision_authenticate",
         state.session_id,
-        {"intent": intent, "input": state.user_input},
+        {"selected_api": "login"},
     )
+    return {"selected_api": "login", "api_args": {}}
 
-    # Handle blocked requests
-    if intent == "blocked":
-        state.selected_api = None
-        state.response = "Your request was blocked due to policy violations."
+
+def _handle_onboard(state: AgentState, user_input: str) -> Dict[str, Any]:
+    # Pre-auth only
+    log_event(
+        "decision_onboard",
+        state.session_id,
+        {"selected_api": "onboard_user"},
+    )
+    return {"selected_api": "onboard_user", "api_args": {}}
+
+
+def _handle_view_self(state: AgentState, user_input: str) -> Dict[str, Any]:
+    log_event(
+        "decision_view_self",
+        state.session_id,
+        {"selected_api": "get_my_profile"},
+    )
+    return {"selected_api": "get_my_profile", "api_args": {}}
+
+
+def _handle_view_employee(state: AgentState, user_input: str) -> Dict[str, Any]:
+    emp_id = state.candidate_employee_id
+    if emp_id is not None:
         log_event(
-            "decision_blocked",
+            "decision_view_employee",
             state.session_id,
-            {"reason": "guardrail_intervention"},
+            {"employee_id": emp_id},
         )
-        return state
-
-    # ------------------------------------------------------------
-    # AUTHENTICATION
-    # ------------------------------------------------------------
-    if intent == "authenticate":
-        state.selected_api = "login"
-        state.api_args = {}
+        return {"selected_api": "get_employee", "api_args": {"employee_id": emp_id}}
+
+    # No fallback
+    log_event(
+        "decision_view_employee_failed",
+        state.session_id,
+        {"reason": "employee not resolved"},
+    )
+    return {"selected_api": "get_employee", "api_args": {}}
+
+
+def _handle_update_employee(state: AgentState, user_input: str) -> Dict[str, Any]:
+    # Generic update
+
+    # Resolve employee
+    emp_id = state.candidate_employee_id
+
+    if emp_id is None:
         log_event(
-            "decision_authenticate",
+            "decision_update_failed",
             state.session_id,
-            {"selected_api": "login"},
+            {"reason": "employee not resolved"},
         )
-        return state
-
-    # ------------------------------------------------------------
-    # ONBOARDING (pre-auth only)
-    # ------------------------------------------------------------
-    if intent == "onboard":
-        state.selected_api = "onboard_user"
-        state.api_args = {}
+        return {"selected_api": "update_employee", "api_args": {}}
+
+    # Expect "update <name> <field> to <value>"
+    if "to" not in user_input:
         log_event(
-            "decision_onboard",
+            "decision_update_failed",
             state.session_id,
-            {"selected_api": "onboard_user"},
+            {"reason": "missing value"},
         )
-        return state
-
-    db = SessionLocal()
-    try:
-        # --------------------------------------------------------
-        # VIEW OWN PROFILE
-        # --------------------------------------------------------
-        if intent == "view_self":
-            state.selected_api = "get_my_profile"
-            state.api_args = {}
-            log_event(
-                "decision_view_self",
-                state.session_id,
-                {"selected_api": "get_my_profile"},
-            )
-            return state
-
-        # --------------------------------------------------------
-        # VIEW EMPLOYEE
-        # --------------------------------------------------------
-        if intent == "view_employee":
-            state.selected_api = "get_employee"
-
-            for emp in db.query(Employee).all():
-                if emp.name.lower() in user_input:
-                    state.api_args = {"employee_id": emp.id}
-                    log_event(
-                        "decision_view_employee",
-                        state.session_id,
-                        {"employee_id": emp.id},
-                    )
-                    return state
-
-            # No fallback
-            state.api_args = {}
-            log_event(
-                "decision_view_employee_failed",
-                state.session_id,
-                {"reason": "employee not resolved"},
-            )
-            return state
-
-        # --------------------------------------------------------
-        # UPDATE EMPLOYEE (GENERIC)
-        # --------------------------------------------------------
-        if intent == "update_employee":
-            state.selected_api = "update_employee"
-
-            # Resolve employee
-            target_emp = None
-            for emp in db.query(Employee).all():
-                if emp.name.lower() in user_input:
-                    target_emp = emp
-                    break
-
-            if not target_emp:
-                state.api_args = {}
-                log_event(
-                    "decision_update_failed",
-                    state.session_id,
-                    {"reason": "employee not resolved"},
-                )
-                return state
-
-            # Expect "update <name> <field> to <value>"
-            if "to" not in user_input:
-                state.api_args = {}
-                log_event(
-                    "decision_update_failed",
-                    state.session_id,
-                    {"reason": "missing value"},
-                )
-                return state
-
-            before, value = user_input.split("to", 1)
-            value = value.strip().title()
-
-            tokens = before.split()
-            field = tokens[-1]  # naive but deterministic
-
-            state.api_args = {
-                "employee_id": target_emp.id,
-                field: value,
-            }
-
-            log_event(
-                "decision_update_employee",
-                state.session_id,
-                state.api_args,
-            )
-            return state
-
-        # --------------------------------------------------------
-        # DELETE EMPLOYEE (STRICT)
-        # --------------------------------------------------------
-        if intent == "delete_employee":
-            state.selected_api = "delete_employee"
-
-            for emp in db.query(Employee).all():
-                if emp.name.lower() in user_input:
-                    state.api_args = {"employee_id": emp.id}
-                    log_event(
-                        "decision_delete_employee",
-                        state.session_id,
-                        state.api_args,
-                    )
-                    return state
-
-            # ❌ No fallback for delete
-            state.api_args = {}
-            log_event(
-                "decision_delete_failed",
-                state.session_id,
-                {"reason": "employee not resolved"},
-            )
-            return state
-
-        # --------------------------------------------------------
-        # NO-OP
-        # --------------------------------------------------------
+        return {"selected_api": "update_employee", "api_args": {}}
+
+    before, value = user_input.split("to", 1)
+    value = value.strip().title()
+
+    tokens = before.split()
+    field = tokens[-1]  # naive but deterministic
+
+    api_args = {
+        "employee_id": emp_id,
+        field: value,
+    }
+
+    log_event(
+        "decision_update_employee",
+        state.session_id,
+        api_args,
+    )
+    return {"selected_api": "update_employee", "api_args": api_args}
+
+
+def _handle_delete_employee(state: AgentState, user_input: str) -> Dict[str, Any]:
+    # Strict: never guess the target
+    emp_id = state.candidate_employee_id
+    if emp_id is not None:
+        api_args = {"employee_id": emp_id}
         log_event(
-            "decision_noop",
+            "decision_delete_employee",
             state.session_id,
-            {"reason": "no actionable intent"},
+            api_args,
         )
-        return state
+        return {"selected_api": "delete_employee", "api_args": api_args}
+
+    # ❌ No fallback for delete
+    log_event(
+        "decision_delete_failed",
+        state.session_id,
+        {"reason": "employee not resolved"},
+    )
+    return {"selected_api": "delete_employee", "api_args": {}}
+
+
+def _handle_noop(state: AgentState, user_input: str) -> Dict[str, Any]:
+    log_event(
+        "decision_noop",
+        state.session_id,
+        {"reason": "no actionable intent"},
+    )
+    return {}
+
+
+_INTENT_HANDLERS: Dict[str, Callable[[AgentState, str], Dict[str, Any]]] = {
+    "blocked": _handle_blocked,
+    "authenticate": _handle_authenticate,
+    "onboard": _handle_onboard,
+    "view_self": _handle_view_self,
+    "view_employee": _handle_view_employee,
+    "update_employee": _handle_update_employee,
+    "delete_employee": _handle_delete_employee,
+}
+
+
+async def decide_action(state: AgentState) -> Dict[str, Any]:
+    """
+    Decide which backend API to invoke and populate api_args.
+
+    HARD RULES:
+    - NEVER mutate authentication or role
+    - NEVER infer privilege
+    - NEVER silently fall back for destructive actions
+    - ALWAYS log decisions
+    """
+
+    user_input = state.user_input_lower or ""
+    intent = state.intent
+
+    log_event(
+        "decision_start",
+        state.session_id,
+        {"intent": intent, "input": state.user_input},
+    )
 
-    finally:
-        db.close()
+    handler = _INTENT_HANDLERS.get(intent, _handle_noop)
+    return handler(state, user_input)
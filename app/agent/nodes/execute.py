@@ -1,310 +1,364 @@
+from typing import Callable, Dict
+
+from langchain_core.runnables import RunnableConfig
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
 from app.agent.state import AgentState
 from app.database import SessionLocal
 from app.models.employee import Employee
+from app.agent.name_index import invalidate_name_index
+from app.agent.employee_cache import (
+    get_employee_by_email,
+    get_employee_by_id,
+    invalidate_employee,
+)
 from app.logging.audit import log_event, log_execution
 
+# Fields that are allowed to be updated
+ALLOWED_FIELDS = frozenset({"location", "status", "salary", "name", "role"})
 
-def execute_action(state: AgentState):
-    """
-    Execute the selected backend action.
+# Where the onboarding name ends ("my name is X and ...")
+_NAME_STOP_WORDS = (" and", " email", " my email")
 
-    RULES:
-    - Never crash
-    - Never silently succeed
-    - Always set state.response
-    - Log everything
-    """
+# Profile response template, parsed once at import
+_PROFILE_FMT = "Name: {0.name} Email: {0.email} Role: {0.role} Location: {0.location}".format
 
-    if not state.selected_api:
-        state.response = "No action was selected."
+
+# ------------------------------------------------------------
+# LOGIN
+# ------------------------------------------------------------
+
+def _do_login(db: Session, state: AgentState) -> AgentState:
+    email = None
+
+    tokens = state.user_input_tokens or []
+    if "email" in tokens:
+        idx = tokens.index("email")
+        if idx + 1 < len(tokens):
+            email = tokens[idx + 1]
+
+    if not email:
+        state.response = "Could not determine email for login."
+        log_event(
+            "auth_failed",
+            state.session_id,
+            {"reason": "email not found"},
+        )
         return state
 
-    db: Session = SessionLocal()
+    employee = get_employee_by_email(db, email)
+    if not employee:
+        state.response = "Invalid credentials."
+        log_event(
+            "auth_failed",
+            state.session_id,
+            {"reason": "employee not found", "email": email},
+        )
+        return state
+
+    state.authenticated = True
+    state.employee_id = employee.id
+    state.role = employee.role
+    state.response = "Authenticated successfully."
+
+    log_event(
+        "auth_success",
+        state.session_id,
+        {"employee_id": employee.id, "role": employee.role},
+    )
+    return state
+
+
+# ------------------------------------------------------------
+# ONBOARDING
+# ------------------------------------------------------------
 
+def _do_onboard(db: Session, state: AgentState) -> AgentState:
     try:
-        # --------------------------------------------------------
-        # LOGIN
-        # --------------------------------------------------------
-        if state.selected_api == "login":
-            user_input = state.user_input or ""
-            email = None
-
-            tokens = user_input.lower().split()
-            if "email" in tokens:
-                idx = tokens.index("email")
-                if idx + 1 < len(tokens):
-                    email = tokens[idx + 1]
-
-            if not email:
-                state.response = "Could not determine email for login."
-                log_event(
-                    "auth_failed",
-                    state.session_id,
-                    {"reason": "email not found"},
-                )
-                return state
-
-            employee = db.query(Employee).filter(Employee.email == email).first()
-            if not employee:
-                state.response = "Invalid credentials."
-                log_event(
-                    "auth_failed",
-                    state.session_id,
-                    {"reason": "employee not found", "email": email},
-                )
-                return state
-
-            state.authenticated = True
-            state.employee_id = employee.id
-            state.role = employee.role
-            state.response = "Authenticated successfully."
+        lower_input = state.user_input_lower or ""
 
+        # -----------------------------
+        # Extract email
+        # -----------------------------
+        tokens = state.user_input_tokens or []
+        email = next((t for t in tokens if "@" in t), None)
+
+        if not email:
+            state.response = "Email is required for onboarding."
             log_event(
-                "auth_success",
+                "onboarding_failed",
                 state.session_id,
-                {"employee_id": employee.id, "role": employee.role},
+                {"reason": "email_missing"},
             )
             return state
 
-        # --------------------------------------------------------
-        # ONBOARDING
-        # --------------------------------------------------------
-        if state.selected_api == "onboard_user":
-            try:
-                user_input = state.user_input or ""
-                lower_input = user_input.lower()
-
-                # -----------------------------
-                # Extract email
-                # -----------------------------
-                tokens = lower_input.split()
-                email = next((t for t in tokens if "@" in t), None)
-
-                if not email:
-                    state.response = "Email is required for onboarding."
-                    log_event(
-                        "onboarding_failed",
-                        state.session_id,
-                        {"reason": "email_missing"},
-                    )
-                    return state
-
-                existing = db.query(Employee).filter(Employee.email == email).first()
-                if existing:
-                    state.response = "User already onboarded."
-                    log_event(
-                        "onboarding_failed",
-                        state.session_id,
-                        {"reason": "user_exists", "email": email},
-                    )
-                    return state
-
-                # -----------------------------
-                # Extract name (deterministic)
-                # -----------------------------
-                name = "New Employee"
-                if "name is" in lower_input:
-                    after = lower_input.split("name is", 1)[1]
-                    stop_words = [" and", " email", " my email"]
-                    for sw in stop_words:
-                        if sw in after:
-                            after = after.split(sw, 1)[0]
-                            break
-                    name = after.strip().title()
-
-                # -----------------------------
-                # Create employee
-                # -----------------------------
-                emp = Employee(
-                    name=name,
-                    email=email,
-                    role="employee",  # enforced
-                    manager_id=None,
-                    salary=0,
-                    status="active",
-                    location="Unknown",
-                )
-
-                db.add(emp)
-                db.commit()
-
-                log_event(
-                    "onboarding_success",
-                    state.session_id,
-                    {"employee_id": emp.id, "email": email},
-                )
-
-                state.response = "You have been onboarded successfully as an employee."
-                return state
-
-            except Exception as e:
-                log_event(
-                    "onboarding_exception",
-                    state.session_id,
-                    {"error": str(e)},
-                )
-                state.response = "Onboarding failed due to a system error."
-                return state
-
-        # --------------------------------------------------------
-        # VIEW OWN PROFILE
-        # --------------------------------------------------------
-        if state.selected_api == "get_my_profile":
-            emp = db.query(Employee).filter(Employee.id == state.employee_id).first()
-            if not emp:
-                state.response = "Profile not found."
-                return state
-
-            state.response = (
-                f"Name: {emp.name} "
-                f"Email: {emp.email} "
-                f"Role: {emp.role} "
-                f"Location: {emp.location}"
+        existing = db.execute(
+            select(1).where(Employee.email == email).limit(1)
+        ).first()
+        if existing is not None:
+            state.response = "User already onboarded."
+            log_event(
+                "onboarding_failed",
+                state.session_id,
+                {"reason": "user_exists", "email": email},
             )
             return state
 
-        # --------------------------------------------------------
-        # VIEW EMPLOYEE
-        # --------------------------------------------------------
-        if state.selected_api == "get_employee":
-            emp_id = state.api_args.get("employee_id") if state.api_args else None
-            if not emp_id:
-                state.response = "No employee specified."
-                return state
-
-            emp = db.query(Employee).filter(Employee.id == emp_id).first()
-            if not emp:
-                state.response = "Employee not found."
-                return state
-
-            state.response = (
-                f"Name: {emp.name} "
-                f"Email: {emp.email} "
-                f"Role: {emp.role} "
-                f"Location: {emp.location}"
-            )
-            return state
+        # -----------------------------
+        # Extract name (deterministic)
+        # -----------------------------
+        name = "New Employee"
+        if "name is" in lower_input:
+            after = lower_input.split("name is", 1)[1]
+            for sw in _NAME_STOP_WORDS:
+                if sw in after:
+                    after = after.split(sw, 1)[0]
+                    break
+            name = after.strip().title()
+
+        # -----------------------------
+        # Create employee
+        # -----------------------------
+        emp = Employee(
+            name=name,
+            email=email,
+            role="employee",  # enforced
+            manager_id=None,
+            salary=0,
+            status="active",
+            location="Unknown",
+        )
+
+        db.add(emp)
+        db.commit()
+        invalidate_name_index()
+        invalidate_employee(email=email)
+
+        log_event(
+            "onboarding_success",
+            state.session_id,
+            {"employee_id": emp.id, "email": email},
+        )
+
+        state.response = "You have been onboarded successfully as an employee."
+        return state
 
-        # --------------------------------------------------------
-        # UPDATE EMPLOYEE (GENERIC)
-        # --------------------------------------------------------
-        if state.selected_api == "update_employee":
-            if not state.api_args or "employee_id" not in state.api_args:
-                state.response = "Could not determine which employee to update."
-                return state
-
-            emp = (
-                db.query(Employee)
-                .filter(Employee.id == state.api_args["employee_id"])
-                .first()
-            )
+    except Exception as e:
+        db.rollback()
+        log_event(
+            "onboarding_exception",
+            state.session_id,
+            {"error": str(e)},
+        )
+        state.response = "Onboarding failed due to a system error."
+        return state
+
+
+# ------------------------------------------------------------
+# VIEW OWN PROFILE
+# ------------------------------------------------------------
 
-            if not emp:
-                state.response = "Employee not found."
-                return state
+def _do_get_my_profile(db: Session, state: AgentState) -> AgentState:
+    emp = get_employee_by_id(db, state.employee_id)
+    if not emp:
+        state.response = "Profile not found."
+        return state
 
-            # Fields that are allowed to be updated
-            ALLOWED_FIELDS = {"location", "status", "salary", "name", "role"}
+    state.response = _PROFILE_FMT(emp)
+    return state
 
-            updated_fields = {}
 
-            for field, value in state.api_args.items():
-                if field == "employee_id":
-                    continue
-                if field not in ALLOWED_FIELDS:
-                    log_event(
-                        "update_field_blocked",
-                        state.session_id,
-                        {"field": field},
-                    )
-                    continue
-                setattr(emp, field, value)
-                updated_fields[field] = value
+# ------------------------------------------------------------
+# VIEW EMPLOYEE
+# ------------------------------------------------------------
 
-            if not updated_fields:
-                state.response = "No valid fields to update."
-                return state
+def _do_get_employee(db: Session, state: AgentState) -> AgentState:
+    emp_id = state.api_args.get("employee_id") if state.api_args else None
+    if not emp_id:
+        state.response = "No employee specified."
+        return state
 
-            db.commit()
+    emp = get_employee_by_id(db, emp_id)
+    if not emp:
+        state.response = "Employee not found."
+        return state
 
-            state.response = f"Updated fields: {', '.join(updated_fields.keys())}"
+    state.response = _PROFILE_FMT(emp)
+    return state
 
-            log_execution(
-                state.session_id,
-                "update_employee",
-                updated_fields,
-            )
-            return state
 
-        # --------------------------------------------------------
-        # DELETE EMPLOYEE (MANDATORY HITL)
-        # --------------------------------------------------------
-        if state.selected_api == "delete_employee":
-            # 1️⃣ Mandatory HITL gate (ABSOLUTE)
-            if not state.hitl_confirmed:
-                state.response = (
-                    "Are you sure you want to delete this employee? "
-                    "Reply 'Yes' to confirm."
-                )
-                log_event(
-                    "delete_hitl_required",
-                    state.session_id,
-                    {"confirmed": False},
-                )
-                return state
-
-            # 2️⃣ Target must be resolved
-            if not state.api_args or "employee_id" not in state.api_args:
-                state.response = "Could not determine which employee to delete."
-                log_event(
-                    "delete_failed_no_target",
-                    state.session_id,
-                    {},
-                )
-                return state
-
-            target_id = state.api_args["employee_id"]
-
-            # 3️⃣ Self-delete is ALWAYS forbidden
-            if target_id == state.employee_id:
-                state.response = "You cannot delete your own profile."
-                log_event(
-                    "delete_denied_self",
-                    state.session_id,
-                    {"employee_id": target_id},
-                )
-                return state
-
-            # 4️⃣ Employee must exist
-            emp = db.query(Employee).filter(Employee.id == target_id).first()
-            if not emp:
-                state.response = "Employee not found."
-                log_event(
-                    "delete_failed_not_found",
-                    state.session_id,
-                    {"employee_id": target_id},
-                )
-                return state
-
-            # 5️⃣ Perform delete
-            db.delete(emp)
-            db.commit()
-
-            state.response = "Employee deleted successfully."
-            log_execution(
+# ------------------------------------------------------------
+# UPDATE EMPLOYEE (GENERIC)
+# ------------------------------------------------------------
+
+def _do_update_employee(db: Session, state: AgentState) -> AgentState:
+    if not state.api_args or "employee_id" not in state.api_args:
+        state.response = "Could not determine which employee to update."
+        return state
+
+    emp_id = state.api_args["employee_id"]
+
+    updated_fields = {}
+
+    for field, value in state.api_args.items():
+        if field == "employee_id":
+            continue
+        if field not in ALLOWED_FIELDS:
+            log_event(
+                "update_field_blocked",
                 state.session_id,
-                "delete_employee",
-                {"employee_id": target_id},
+                {"field": field},
             )
-            return state
+            continue
+        updated_fields[field] = value
+
+    if not updated_fields:
+        if db.get(Employee, emp_id) is None:
+            state.response = "Employee not found."
+        else:
+            state.response = "No valid fields to update."
+        return state
+
+    # Single UPDATE; the row is never loaded into the session
+    result = db.execute(
+        update(Employee)
+        .where(Employee.id == emp_id)
+        .values(**updated_fields)
+    )
+    if result.rowcount == 0:
+        db.rollback()
+        state.response = "Employee not found."
+        return state
+
+    db.commit()
+    invalidate_employee(emp_id)
+    if "name" in updated_fields:
+        invalidate_name_index()
+
+    state.response = f"Updated fields: {', '.join(updated_fields.keys())}"
+
+    log_execution(
+        state.session_id,
+        "update_employee",
+        updated_fields,
+    )
+    return state
+
+
+# ------------------------------------------------------------
+# DELETE EMPLOYEE (MANDATORY HITL)
+# ------------------------------------------------------------
+
+def _do_delete_employee(db: Session, state: AgentState) -> AgentState:
+    # 1️⃣ Mandatory HITL gate (ABSOLUTE)
+    if not state.hitl_confirmed:
+        state.response = (
+            "Are you sure you want to delete this employee? "
+            "Reply 'Yes' to confirm."
+        )
+        log_event(
+            "delete_hitl_required",
+            state.session_id,
+            {"confirmed": False},
+        )
+        return state
+
+    # 2️⃣ Target must be resolved
+    if not state.api_args or "employee_id" not in state.api_args:
+        state.response = "Could not determine which employee to delete."
+        log_event(
+            "delete_failed_no_target",
+            state.session_id,
+            {},
+        )
+        return state
+
+    target_id = state.api_args["employee_id"]
+
+    # 3️⃣ Self-delete is ALWAYS forbidden
+    if target_id == state.employee_id:
+        state.response = "You cannot delete your own profile."
+        log_event(
+            "delete_denied_self",
+            state.session_id,
+            {"employee_id": target_id},
+        )
+        return state
+
+    # 4️⃣ Employee must exist
+    emp = db.get(Employee, target_id)
+    if not emp:
+        state.response = "Employee not found."
+        log_event(
+            "delete_failed_not_found",
+            state.session_id,
+            {"employee_id": target_id},
+        )
+        return state
+
+    # 5️⃣ Perform delete
+    db.delete(emp)
+    db.commit()
+    invalidate_name_index()
+    invalidate_employee(target_id)
+
+    state.response = "Employee deleted successfully."
+    log_execution(
+        state.session_id,
+        "delete_employee",
+        {"employee_id": target_id},
+    )
+    return state
+
+
+_DISPATCH: Dict[str, Callable[[Session, AgentState], AgentState]] = {
+    "login": _do_login,
+    "onboard_user": _do_onboard,
+    "get_my_profile": _do_get_my_profile,
+    "get_employee": _do_get_employee,
+    "update_employee": _do_update_employee,
+    "delete_employee": _do_delete_employee,
+}
+
 
-        # --------------------------------------------------------
-        # DEFAULT
-        # --------------------------------------------------------
+def execute_action(state: AgentState, config: RunnableConfig):
+    """
+    Execute the selected backend action.
+
+    RULES:
+    - Never crash
+    - Never silently succeed
+    - Always set state.response
+    - Log everything
+
+    Runs on the caller's request session, passed as
+    config["configurable"]["db"]; a private session is opened only
+    when the graph is invoked without one.
+    """
+
+    if not state.selected_api:
+        state.response = "No action was selected."
+        return state
+
+    handler = _DISPATCH.get(state.selected_api)
+    if handler is None:
         state.response = "Action could not be completed."
         return state
 
+    db: Session = (config.get("configurable") or {}).get("db")
+    owns_session = db is None
+    if owns_session:
+        db = SessionLocal()
+
+    try:
+        return handler(db, state)
+
+    except Exception:
+        # Leave the shared session usable for the caller's final commit
+        db.rollback()
+        raise
+
     finally:
-        db.close()
+        if owns_session:
+            db.close()
@@ -18,7 +18,7 @@ def handle_hitl(state: AgentState):
     if state.hitl_confirmed:
         return state
 
-    user_input = (state.user_input or "").strip().lower()
+    user_input = state.user_input_lower or ""
 
     # Confirmation message
     if user_input in {"yes", "y", "confirm"}:
@@ -1,19 +1,31 @@
-import sys
 from app.agent.state import AgentState
 from app.logging.audit import log_event
 from app.agent.llm import classify_intent
+from app.agent.name_index import resolve_employee_id
 
 
-def extract_intent(state: AgentState) -> AgentState:
-    # Debug logging to stderr (appears in CloudWatch)
-    print(f"🔍 DEBUG: Calling LLM with input: '{state.user_input}'", file=sys.stderr)
+async def extract_intent(state: AgentState) -> dict:
+    """
+    Classify the user's intent.
 
-    result = classify_intent(state.user_input)
-    state.intent = result.get("intent", "unknown")
-
-    print(f"🔍 DEBUG: Classified intent = '{state.intent}'", file=sys.stderr)
+    Runs in parallel with load_candidates, so it returns only the field
+    it owns instead of the whole state.
+    """
+    result = await classify_intent(state.user_input)
+    intent = result.get("intent", "unknown")
 
     # Proper audit log
-    log_event("intent_classified", state.session_id, {"intent": state.intent})
+    log_event("intent_classified", state.session_id, {"intent": intent})
+
+    return {"intent": intent}
+
+
+def load_candidates(state: AgentState) -> dict:
+    """
+    Resolve the employee named in the user input, if any.
 
-    return state
+    Needs nothing from intent classification, so it runs alongside it
+    and the name lookup overlaps the Bedrock round-trip.
+    """
+    user_input = state.user_input_lower or ""
+    return {"candidate_employee_id": resolve_employee_id(user_input)}
@@ -1,5 +1,6 @@
-from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any, List
+import orjson
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class AgentState(BaseModel):
@@ -16,6 +17,9 @@ class AgentState(BaseModel):
     - No automatic reset on authentication
     - No provenance tracking
     """
+
+    # Nodes assign fields freely on every turn; keep that a plain setattr
+    model_config = ConfigDict(validate_assignment=False)
     
     # ------------------------------------------------------------------
     # Session context
@@ -28,6 +32,10 @@ class AgentState(BaseModel):
     # ------------------------------------------------------------------
 
     user_input: str | None = None
+
+    # Normalized once per turn by set_user_input(); not persisted
+    user_input_lower: Optional[str] = Field(default=None, exclude=True)
+    user_input_tokens: Optional[List[str]] = Field(default=None, exclude=True)
     
     # ------------------------------------------------------------------
     # Agent response to user
@@ -48,6 +56,7 @@ class AgentState(BaseModel):
     # ------------------------------------------------------------------
 
     intent: Optional[str] = None
+    candidate_employee_id: Optional[int] = None  # name match in user_input
     selected_api: Optional[str] = None
     api_args: Optional[Dict[str, Any]] = None
 
@@ -84,21 +93,45 @@ class AgentState(BaseModel):
         self.awaiting_confirmation = False
         self.pending_action = None
 
+    def set_user_input(self, text: str):
+        """
+        Set the input for this turn along with its lowercased and
+        tokenized forms, so nodes don't each re-derive them.
+        """
+        self.user_input = text
+        self.user_input_lower = (text or "").strip().lower()
+        self.user_input_tokens = self.user_input_lower.split()
+
     def to_dict(self) -> Dict[str, Any]:
         """
         Serialize state for persistence.
+
+        Fields still at their default are left out; from_dict() restores
+        them.
+        """
+        return self.model_dump(exclude_none=True, exclude_defaults=True)
+
+    def to_json(self) -> str:
+        """
+        Serialize state to the JSON text stored in AgentSession.state_json.
         """
-        return self.dict()
+        return orjson.dumps(self.to_dict()).decode()
 
     @classmethod
     def from_dict(cls, data: dict):
         """
-        Rehydrate AgentState from persisted dict WITHOUT
-        resetting missing fields to defaults.
+        Rehydrate AgentState from persisted dict.
+
+        Missing fields take their defaults and unknown keys are ignored.
+        Persisted state is trusted, so validation is skipped.
+        """
+        fields = cls.model_fields
+        return cls.model_construct(**{k: v for k, v in data.items() if k in fields})
+
+    @classmethod
+    def from_json(cls, data: str):
+        """
+        Rehydrate AgentState from AgentSession.state_json.
         """
-        state = cls()  # start with defaults
-        for key, value in data.items():
-            if hasattr(state, key):
-                setattr(state, key, value)
-        return state
+        return cls.from_dict(orjson.loads(data))
 
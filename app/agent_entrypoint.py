@@ -1,26 +1,29 @@
-import json
 import uuid
 import traceback
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 
 from fastapi import FastAPI, HTTPException, Depends
 from pydantic import BaseModel
 import uvicorn
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from app.database import get_db, init_db, SessionLocal
 from app.agent.graph import agent_graph
+from app.agent.llm import close_bedrock_client
 from app.agent.state import AgentState
+from app.api.agent import _load_session, _persist_turn
 from app.models.agent_session import AgentSession
-from app.models.agent_message import AgentMessage
-from app.logging.audit import log_error
+from app.logging.audit import AuditBuffer, log_error
 from app.seed.seed_data import seed_employees
 
-app = FastAPI()
 
-
-# Initialize database on startup
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database tables and seed data on startup"""
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Initialize database tables and seed data on startup, and release
+    the shared Bedrock client on shutdown.
+    """
     try:
         # Create all tables
         init_db()
@@ -37,6 +40,26 @@ async def startup_event():
         print(f"Database initialization error: {e}")
         traceback.print_exc()
 
+    yield
+    await close_bedrock_client()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+def _create_session(db: Session, session_id: str):
+    initial_state = AgentState.model_construct(session_id=session_id)
+
+    agent_session = AgentSession(
+        session_id=session_id,
+        authenticated=False,
+        employee_id=None,
+        role=None,
+        state_json=initial_state.to_json(),
+    )
+    db.add(agent_session)
+    db.commit()
+
 
 class InvocationRequest(BaseModel):
     """AgentCore invocation payload"""
@@ -55,6 +78,9 @@ async def invocations(request: InvocationRequest, db: Session = Depends(get_db))
     """
     REQUIRED endpoint for AgentCore
     Handles both session creation and chat
+
+    Blocking SQLite I/O runs in the threadpool so it never stalls the
+    event loop; only the graph is awaited here.
     """
     try:
         payload = request.input
@@ -62,18 +88,7 @@ async def invocations(request: InvocationRequest, db: Session = Depends(get_db))
 
         if action == "create_session":
             session_id = str(uuid.uuid4())
-            initial_state = AgentState(session_id=session_id)
-
-            agent_session = AgentSession(
-                session_id=session_id,
-                authenticated=False,
-                employee_id=None,
-                role=None,
-                state_json=json.dumps(initial_state.to_dict()),
-            )
-            db.add(agent_session)
-            db.commit()
-            db.refresh(agent_session)
+            await run_in_threadpool(_create_session, db, session_id)
 
             return InvocationResponse(
                 output={"session_id": session_id, "status": "created"}
@@ -94,70 +109,80 @@ async def invocations(request: InvocationRequest, db: Session = Depends(get_db))
                     }
                 )
 
-            agent_session = (
-                db.query(AgentSession)
-                .filter(AgentSession.session_id == session_id)
-                .first()
-            )
+            agent_session = await run_in_threadpool(_load_session, db, session_id)
 
             if not agent_session:
                 return InvocationResponse(
                     output={"session_id": session_id, "message": "Invalid session."}
                 )
 
-            state_data = json.loads(agent_session.state_json)
-            state = AgentState.from_dict(state_data)
+            state = AgentState.from_json(agent_session.state_json)
             state.session_id = session_id
-            state.user_input = user_message
+            state.set_user_input(user_message)
+
+            # Persisted together with the agent response below
+            user_msg = {
+                "session_id": session_id,
+                "sender": "user",
+                "message": user_message,
+                "timestamp": datetime.now(timezone.utc),
+            }
+
+            audit = AuditBuffer(session_id)
+
+            # Inside the buffer, so an error event is persisted with the turn
+            with audit:
+                try:
+                    result = await agent_graph.ainvoke(
+                        state, config={"configurable": {"db": db}}
+                    )
+                    if isinstance(result, AgentState):
+                        result_state = result
+                    else:
+                        result_state = AgentState.from_dict(result)
+
+                    if result_state.response is None:
+                        result_state.response = "Done."
+
+                except PermissionError as e:
+                    result_state = state
+                    result_state.response = str(e)
+
+                except Exception as e:
+                    result_state = state
+                    result_state.response = (
+                        "Sorry, something went wrong while processing your request."
+                    )
+                    log_error(session_id, e)
 
-            db.add(
-                AgentMessage(
-                    session_id=session_id,
-                    sender="user",
-                    message=user_message,
-                )
+            # Update session authentication state if login was successful
+            session_fields = (
+                {
+                    "authenticated": result_state.authenticated,
+                    "employee_id": result_state.employee_id,
+                    "role": result_state.role,
+                }
+                if result_state.authenticated
+                else None
             )
-            db.commit()
-
-            try:
-                result = agent_graph.invoke(state)
-                if isinstance(result, AgentState):
-                    result_state = result
-                else:
-                    result_state = AgentState.from_dict(result)
-
-                if result_state.response is None:
-                    result_state.response = "Done."
-
-            except PermissionError as e:
-                result_state = state
-                result_state.response = str(e)
-
-            except Exception as e:
-                result_state = state
-                result_state.response = (
-                    "Sorry, something went wrong while processing your request."
-                )
-                log_error(session_id, e)
-
-            agent_session.state_json = json.dumps(result_state.to_dict())
 
-            # Update session authentication state if login was successful
-            if result_state.authenticated:
-                agent_session.authenticated = result_state.authenticated
-                agent_session.employee_id = result_state.employee_id
-                agent_session.role = result_state.role
-
-            db.commit()
-
-            db.add(
-                AgentMessage(
-                    session_id=session_id,
-                    sender="agent",
-                    message=result_state.response,
-                )
+            await run_in_threadpool(
+                _persist_turn,
+                db,
+                agent_session,
+                result_state.to_json(),
+                [
+                    user_msg,
+                    {
+                        "session_id": session_id,
+                        "sender": "agent",
+                        "message": result_state.response,
+                        "timestamp": datetime.now(timezone.utc),
+                    },
+                ],
+                audit.events,
+                session_fields,
             )
-            db.commit()
 
             return InvocationResponse(
                 output={
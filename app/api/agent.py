@@ -1,18 +1,26 @@
-import json
 import uuid
+from datetime import datetime, timezone
+
+from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, raiseload
+from starlette.concurrency import run_in_threadpool
 
 from app.database import get_db
 from app.agent.graph import agent_graph
 from app.agent.state import AgentState
 from app.models.agent_session import AgentSession
 from app.models.agent_message import AgentMessage
-from app.logging.audit import log_error
+from app.models.types import is_session_id
+from app.logging.audit import AuditBuffer, log_error, persist_audit_events
 
 router = APIRouter(prefix="/agent", tags=["agent"])
 
+# Built once; both messages of a turn go through it as one executemany
+_INSERT_MESSAGE = insert(AgentMessage)
+
 
 # ------------------------------------------------------------------
 # Create a new agent session
@@ -22,11 +30,11 @@ router = APIRouter(prefix="/agent", tags=["agent"])
 def create_session(db: Session = Depends(get_db)):
     session_id = str(uuid.uuid4())
 
-    initial_state = AgentState(session_id=session_id)
+    initial_state = AgentState.model_construct(session_id=session_id)
 
     agent_session = AgentSession(
         session_id=session_id,
-        state_json=json.dumps(initial_state.to_dict()),
+        state_json=initial_state.to_json(),
     )
 
     db.add(agent_session)
@@ -38,9 +46,41 @@ def create_session(db: Session = Depends(get_db)):
 # ------------------------------------------------------------------
 # Chat with the agent
 # ------------------------------------------------------------------
+#
+# The route is async so the graph's Bedrock call does not hold a worker
+# thread. Its own blocking SQLite I/O (session load, turn commit) hops
+# to the threadpool so it never stalls the event loop.
+
+def _load_session(db: Session, session_id: str) -> Optional[AgentSession]:
+    # PK lookup; raiseload turns any accidental lazy load into an error
+    if not is_session_id(session_id):
+        return None
+    return db.get(AgentSession, session_id, options=[raiseload("*")])
+
+
+def _persist_turn(
+    db: Session,
+    agent_session: AgentSession,
+    state_json: str,
+    messages: List[Dict[str, Any]],
+    audit_events: List[Dict[str, Any]],
+    session_fields: Optional[Dict[str, Any]] = None,
+):
+    # State, both messages and the audit trail, in one commit
+    try:
+        agent_session.state_json = state_json
+        for field, value in (session_fields or {}).items():
+            setattr(agent_session, field, value)
+        db.execute(_INSERT_MESSAGE, messages)
+        persist_audit_events(db, audit_events)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
 
 @router.post("/chat/{session_id}")
-def chat(session_id: str, payload: dict, db: Session = Depends(get_db)):
+async def chat(session_id: str, payload: dict, db: Session = Depends(get_db)):
     user_message = payload.get("message", "").strip()
 
     if not user_message:
@@ -53,11 +93,7 @@ def chat(session_id: str, payload: dict, db: Session = Depends(get_db)):
     # Load agent session
     # --------------------------------------------------------------
 
-    agent_session = (
-        db.query(AgentSession)
-        .filter(AgentSession.session_id == session_id)
-        .first()
-    )
+    agent_session = await run_in_threadpool(_load_session, db, session_id)
 
     if not agent_session:
         return {
@@ -69,76 +105,80 @@ def chat(session_id: str, payload: dict, db: Session = Depends(get_db)):
     # Rehydrate agent state
     # --------------------------------------------------------------
 
-    state_data = json.loads(agent_session.state_json)
-    state = AgentState.from_dict(state_data)
+    state = AgentState.from_json(agent_session.state_json)
     state.session_id = session_id
-    state.user_input = user_message
+    state.set_user_input(user_message)
 
     # --------------------------------------------------------------
-    # Persist user message (audit log)
+    # User message (audit log), persisted with the rest of the turn
     # --------------------------------------------------------------
 
-    db.add(
-        AgentMessage(
-            session_id=session_id,
-            sender="user",
-            message=user_message,
-        )
-    )
-    db.commit()
+    user_msg = {
+        "session_id": session_id,
+        "sender": "user",
+        "message": user_message,
+        "timestamp": datetime.now(timezone.utc),
+    }
 
     # --------------------------------------------------------------
     # Run agent graph with FULL error protection
     # --------------------------------------------------------------
 
-    try:
-        result = agent_graph.invoke(state)
-
-        # LangGraph may return AgentState OR dict
-        if isinstance(result, AgentState):
-            result_state = result
-        else:
-            result_state = AgentState.from_dict(result)
-        
-        # print("DEBUG AFTER GRAPH:", result_state.to_dict())
-        # Only default if NO node set a response at all
-        if result_state.response is None:
-            result_state.response = "Done."
-
-    except PermissionError as e:
-        # Expected authorization failure
-        result_state = state
-        result_state.response = str(e)
-        # print("DEBUG PERMISSION STATE:", result_state.to_dict())
-
-    except Exception as e:
-        # Never leak internal errors to UI
-        result_state = state
-        result_state.response = (
-            "Sorry, something went wrong while processing your request."
-        )
-        log_error(session_id, e)
-        # print("DEBUG ERROR STATE:", result_state.to_dict())
-
-    # --------------------------------------------------------------
-    # Persist state no matter what
-    # --------------------------------------------------------------
-
-    agent_session.state_json = json.dumps(result_state.to_dict())
-    db.commit()
+    audit = AuditBuffer(session_id)
+
+    # Inside the buffer, so an error event is persisted with the turn
+    with audit:
+        try:
+            result = await agent_graph.ainvoke(
+                state, config={"configurable": {"db": db}}
+            )
+
+            # LangGraph may return AgentState OR dict
+            if isinstance(result, AgentState):
+                result_state = result
+            else:
+                result_state = AgentState.from_dict(result)
+
+            # print("DEBUG AFTER GRAPH:", result_state.to_dict())
+            # Only default if NO node set a response at all
+            if result_state.response is None:
+                result_state.response = "Done."
+
+        except PermissionError as e:
+            # Expected authorization failure
+            result_state = state
+            result_state.response = str(e)
+            # print("DEBUG PERMISSION STATE:", result_state.to_dict())
+
+        except Exception as e:
+            # Never leak internal errors to UI
+            result_state = state
+            result_state.response = (
+                "Sorry, something went wrong while processing your request."
+            )
+            log_error(session_id, e)
+            # print("DEBUG ERROR STATE:", result_state.to_dict())
 
     # --------------------------------------------------------------
-    # Persist agent response (audit log)
+    # Persist state and both messages no matter what, in one commit
     # --------------------------------------------------------------
 
-    db.add(
-        AgentMessage(
-            session_id=session_id,
-            sender="agent",
-            message=result_state.response,
-        )
+    await run_in_threadpool(
+        _persist_turn,
+        db,
+        agent_session,
+        result_state.to_json(),
+        [
+            user_msg,
+            {
+                "session_id": session_id,
+                "sender": "agent",
+                "message": result_state.response,
+                "timestamp": datetime.now(timezone.utc),
+            },
+        ],
+        audit.events,
     )
-    db.commit()
 
     return {
         "session_id": session_id,
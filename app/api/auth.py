@@ -1,8 +1,12 @@
+import hashlib
+import hmac
+
 from fastapi import APIRouter, HTTPException, Depends
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
+from app.agent.employee_cache import get_employee_by_email
 from app.database import get_db
-from app.models.employee import Employee
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -12,10 +16,25 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 DEMO_ACCESS_CODE = "123456"
 
+# Compared as fixed-length digests so the check runs in constant time
+_DEMO_DIGEST = hashlib.sha256(DEMO_ACCESS_CODE.encode()).digest()
+
+
+class LoginIn(BaseModel):
+    email: str
+    access_code: str
+
 
-@router.post("/login")
+class LoginOut(BaseModel):
+    employee_id: int
+    email: str
+    role: str
+    status: str
+
+
+@router.post("/login", response_model=LoginOut)
 def login(
-    payload: dict,
+    payload: LoginIn,
     db: Session = Depends(get_db),
 ):
     """
@@ -27,17 +46,15 @@ def login(
     - Returns identity context only
     """
 
-    email = payload.get("email")
-    access_code = payload.get("access_code")
-
-    if not email or not access_code:
-        raise HTTPException(status_code=400, detail="email and access_code required")
+    email = payload.email
 
-    if access_code != DEMO_ACCESS_CODE:
+    supplied = hashlib.sha256(payload.access_code.encode()).digest()
+    if not hmac.compare_digest(supplied, _DEMO_DIGEST):
         raise HTTPException(status_code=401, detail="Invalid access code")
 
-    employee = db.query(Employee).filter(Employee.email == email).first()
-    if not employee:
+    # Shared with the agent's login path; invalidated on every write
+    employee = get_employee_by_email(db, email)
+    if employee is None:
         raise HTTPException(status_code=404, detail="Employee not found")
 
     return {
@@ -1,29 +1,117 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import List, Literal, Optional
 
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import select
+from sqlalchemy.orm import Session, aliased
+from starlette.concurrency import run_in_threadpool
+
+from app.agent.employee_cache import (
+    get_employee_record,
+    invalidate_employee,
+    peek_employee_record,
+)
+from app.agent.name_index import invalidate_name_index
 from app.database import get_db
 from app.models.employee import Employee
 
 router = APIRouter(prefix="/employee", tags=["employee"])
 
 
+class EmployeeOut(BaseModel):
+    """
+    Response body for employee routes. Declaring it lets FastAPI
+    serialize straight to JSON bytes with pydantic-core instead of
+    walking the result with jsonable_encoder.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    email: str
+    role: str
+    manager_id: Optional[int] = None
+    salary: int
+    status: str
+    location: str
+
+
+class EmployeeUpdate(BaseModel):
+    """
+    Fields a PUT may change. Anything else in the body is ignored.
+
+    Omitted fields are left alone (the default is never validated or
+    applied). Only manager_id may be set to null; null for a NOT NULL
+    column is a 422, not a failed commit.
+    """
+
+    name: str = None
+    email: str = None
+    role: Literal["employee", "manager", "hr"] = None
+    salary: int = None
+    status: Literal["active", "terminated"] = None
+    location: str = None
+    manager_id: Optional[int] = None
+
+
 # ------------------------------------------------------------------
 # Helper (intentionally weak)
 # ------------------------------------------------------------------
 
 def get_employee_or_404(db: Session, employee_id: int) -> Employee:
-    employee = db.query(Employee).filter(Employee.id == employee_id).first()
+    employee = db.get(Employee, employee_id)
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
     return employee
 
 
+def get_employee_record_or_404(db: Session, employee_id: int) -> dict:
+    # Read-only routes: served from the employee cache
+    record = get_employee_record(db, employee_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    return record
+
+
+async def read_employee_record(db: Session, employee_id: int) -> dict:
+    # Cache hits stay on the event loop; only misses hop to a worker
+    # thread for the blocking SQLite read.
+    record = peek_employee_record(employee_id)
+    if record is not None:
+        return record
+    return await run_in_threadpool(get_employee_record_or_404, db, employee_id)
+
+
+def get_subtree(db: Session, root_id: int) -> List[Employee]:
+    """
+    Every employee below `root_id` in the org chart, at any depth.
+
+    One recursive CTE, so SQLite walks the hierarchy through
+    ix_emp_mgr_status instead of one query per level. UNION (not
+    UNION ALL) drops revisited ids, so a manager_id cycle terminates.
+    """
+    sub = (
+        select(Employee.id)
+        .where(Employee.manager_id == root_id)
+        .cte("sub", recursive=True)
+    )
+    child = aliased(Employee)
+    sub = sub.union(select(child.id).join(sub, child.manager_id == sub.c.id))
+
+    return list(
+        db.scalars(
+            select(Employee).join(sub, Employee.id == sub.c.id).order_by(Employee.id)
+        )
+    )
+
+
 # ------------------------------------------------------------------
 # APIs
 # ------------------------------------------------------------------
 
-@router.get("/me")
-def get_my_profile(
+@router.get("/me", response_model=EmployeeOut)
+async def get_my_profile(
     employee_id: int | None = None,
     db: Session = Depends(get_db),
 ):
@@ -37,11 +125,11 @@ def get_my_profile(
     if employee_id is None:
         raise HTTPException(status_code=400, detail="employee_id is required")
 
-    return get_employee_or_404(db, employee_id)
+    return await read_employee_record(db, employee_id)
 
 
-@router.get("/{employee_id}")
-def get_employee(
+@router.get("/{employee_id}", response_model=EmployeeOut)
+async def get_employee(
     employee_id: int,
     db: Session = Depends(get_db),
 ):
@@ -52,13 +140,28 @@ def get_employee(
     - No role checks
     - No ownership checks
     """
-    return get_employee_or_404(db, employee_id)
+    return await read_employee_record(db, employee_id)
+
+
+@router.get("/{employee_id}/reports", response_model=List[EmployeeOut])
+def get_reports(
+    employee_id: int,
+    db: Session = Depends(get_db),
+):
+    """
+    Return everyone who reports to an employee, directly or indirectly.
 
+    NOTE (Phase 1):
+    - No role checks
+    """
+    get_employee_or_404(db, employee_id)
+    return get_subtree(db, employee_id)
 
-@router.put("/{employee_id}")
+
+@router.put("/{employee_id}", response_model=EmployeeOut)
 def update_employee(
     employee_id: int,
-    payload: dict,
+    payload: EmployeeUpdate,
     db: Session = Depends(get_db),
 ):
     """
@@ -74,12 +177,15 @@ def update_employee(
     employee = get_employee_or_404(db, employee_id)
 
     # Update only fields provided
-    for field, value in payload.items():
-        if hasattr(employee, field):
-            setattr(employee, field, value)
+    changes = payload.model_dump(exclude_unset=True)
+    for field, value in changes.items():
+        setattr(employee, field, value)
 
     db.commit()
-    db.refresh(employee)
+    invalidate_employee(employee_id)
+
+    if "name" in changes:
+        invalidate_name_index()
 
     return employee
 
@@ -104,5 +210,7 @@ def delete_employee(
 
     db.delete(employee)
     db.commit()
+    invalidate_name_index()
+    invalidate_employee(employee_id)
 
     return {"status": "deleted", "employee_id": employee_id}
@@ -1,5 +1,8 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
+import os
+import uuid
 from pathlib import Path
 
 # ------------------------------------------------------------------
@@ -8,9 +11,9 @@ from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = BASE_DIR / "data"
-DATA_DIR.mkdir(exist_ok=True)
 
-DATABASE_URL = f"sqlite:///{DATA_DIR / 'app.db'}"
+# Overridable so each pytest-xdist worker can use its own file
+DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{DATA_DIR / 'app.db'}")
 
 # ------------------------------------------------------------------
 # SQLAlchemy engine & session
@@ -19,12 +22,51 @@ DATABASE_URL = f"sqlite:///{DATA_DIR / 'app.db'}"
 engine = create_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False},  # required for SQLite + FastAPI
+    # Keep sqlite3 connections (and their page caches) alive across
+    # requests. Not StaticPool: one shared handle would interleave the
+    # transactions of concurrent threadpool requests.
+    poolclass=QueuePool,
+    pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
     echo=False,  # set to True if you want SQL logs
 )
 
+# Per-connection SQLite tuning. WAL lets readers run alongside a commit
+# instead of queueing behind it; NORMAL sync is durable enough under WAL.
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "cache_size=-64000",  # KiB, i.e. ~64 MB page cache
+    "busy_timeout=5000",
+)
+
+
+@event.listens_for(engine, "do_connect")
+def _ensure_data_dir(*_args):
+    # Created when the pool first opens a connection, not at import time
+    DATA_DIR.mkdir(exist_ok=True)
+
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_conn, _record):
+    url = engine.url
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return  # WAL is meaningless for in-memory databases
+    cur = dbapi_conn.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cur.execute(f"PRAGMA {pragma}")
+    finally:
+        cur.close()
+
+
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
+    # Sessions are per-request; re-selecting every instance after each
+    # commit only buys round-trips.
+    expire_on_commit=False,
     bind=engine,
 )
 
@@ -48,6 +90,56 @@ def get_db():
 # Initialization
 # ------------------------------------------------------------------
 
+# Stored in SQLite's PRAGMA user_version; bump it with each data
+# migration added to migrate_sqlite()
+SCHEMA_VERSION = 1
+
+# Columns that held session ids as 36-char text before SessionId
+_SESSION_ID_TABLES = ("agent_sessions", "agent_messages", "audit_log")
+
+
+def _session_ids_to_bytes(conn):
+    """
+    Rewrite text UUID session ids as the 16 raw bytes SessionId stores.
+    Values that are not UUIDs could never be looked up and are left as is.
+    """
+    for table in _SESSION_ID_TABLES:
+        old_ids = conn.execute(
+            text(
+                f"SELECT DISTINCT session_id FROM {table} "
+                "WHERE typeof(session_id) = 'text'"
+            )
+        ).scalars()
+
+        params = []
+        for old in old_ids:
+            try:
+                params.append({"old": old, "new": uuid.UUID(old).bytes})
+            except ValueError:
+                continue
+
+        if params:
+            conn.execute(
+                text(f"UPDATE {table} SET session_id = :new WHERE session_id = :old"),
+                params,
+            )
+
+
+def migrate_sqlite(conn):
+    """
+    Bring the data in an existing SQLite database up to SCHEMA_VERSION.
+    Runs after create_all(), so every table exists.
+    """
+    version = conn.execute(text("PRAGMA user_version")).scalar()
+    if version >= SCHEMA_VERSION:
+        return
+
+    if version < 1:
+        _session_ids_to_bytes(conn)
+
+    conn.execute(text(f"PRAGMA user_version = {SCHEMA_VERSION}"))
+
+
 def init_db():
     """
     Import all models and create tables.
@@ -56,5 +148,10 @@ def init_db():
     from app.models.employee import Employee  # noqa
     from app.models.agent_session import AgentSession  # noqa
     from app.models.agent_message import AgentMessage  # noqa
+    from app.models.audit_log import AuditLog  # noqa
 
     Base.metadata.create_all(bind=engine)
+
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as conn:
+            migrate_sqlite(conn)
@@ -1,7 +1,17 @@
-import json
+import atexit
 import logging
-from datetime import datetime
-from typing import Any, Dict, Optional
+import logging.handlers
+import queue
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import orjson
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.audit_log import AuditLog
 
 # ------------------------------------------------------------------
 # Logger configuration
@@ -15,10 +25,101 @@ if not logger.handlers:
         fmt="%(asctime)s | %(levelname)s | %(message)s"
     )
     handler.setFormatter(formatter)
-    logger.addHandler(handler)
+
+    # Request threads only enqueue; a background listener does the I/O
+    _audit_queue = queue.SimpleQueue()
+    _audit_listener = logging.handlers.QueueListener(_audit_queue, handler)
+    _audit_listener.start()
+    atexit.register(_audit_listener.stop)
+
+    logger.addHandler(logging.handlers.QueueHandler(_audit_queue))
 
 logger.setLevel(logging.INFO)
 
+_DUMPS_OPTS = orjson.OPT_NON_STR_KEYS
+
+
+def _dumps(obj: Any) -> str:
+    return orjson.dumps(obj, default=str, option=_DUMPS_OPTS).decode()
+
+
+# Events buffered for the current request (None = write immediately)
+_audit_buffer: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar(
+    "audit_buffer", default=None
+)
+
+
+class AuditBuffer:
+    """
+    Collect every log_event() of one request and write them as a single
+    structured event when the block exits (including on exceptions).
+
+    The buffer is a context variable, so it follows the request into
+    LangGraph's node tasks and executor threads. The collected events
+    stay available on `.events` for persist_audit_events().
+    """
+
+    def __init__(self, session_id: Optional[str] = None):
+        self.session_id = session_id
+        self.events: List[Dict[str, Any]] = []
+        self._token = None
+
+    def __enter__(self):
+        self._token = _audit_buffer.set([])
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.events = _audit_buffer.get()
+        _audit_buffer.reset(self._token)
+        audit_flush(self.session_id, self.events)
+        return False
+
+
+def audit_flush(session_id: Optional[str], events: List[Dict[str, Any]]):
+    """
+    Write a batch of buffered events as one audit record.
+    """
+    if not events:
+        return
+
+    logger.info(
+        _dumps(
+            {
+                "event_type": "request_events",
+                "session_id": session_id,
+                "timestamp_ns": time.time_ns(),
+                "events": events,
+            }
+        )
+    )
+
+
+def persist_audit_events(db: Session, events: List[Dict[str, Any]]):
+    """
+    Stage buffered events as one multi-row INSERT into audit_log.
+
+    Runs on the caller's session and is committed with the rest of the
+    request's writes.
+    """
+    if not events:
+        return
+
+    db.execute(
+        insert(AuditLog),
+        [
+            {
+                "session_id": event["session_id"],
+                "event_type": event["event_type"],
+                "details": _dumps(event["details"]),
+                "timestamp": datetime.fromtimestamp(
+                    event["timestamp_ns"] / 1e9, timezone.utc
+                ),
+            }
+            for event in events
+        ],
+    )
+
+
 # ------------------------------------------------------------------
 # Helper functions
 # ------------------------------------------------------------------
@@ -35,16 +136,22 @@ def log_event(
     - This is NOT the authoritative audit log
     - SQLite tables remain the source of truth
     - This is for observability and debugging
+    - Inside an AuditBuffer the event is deferred to the buffer's flush
     """
 
     payload = {
         "event_type": event_type,
         "session_id": session_id,
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp_ns": time.time_ns(),
         "details": details or {},
     }
 
-    logger.info(json.dumps(payload))
+    buffered = _audit_buffer.get()
+    if buffered is not None:
+        buffered.append(payload)
+        return
+
+    logger.info(_dumps(payload))
 
 
 def log_agent_decision(
@@ -1,7 +1,11 @@
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from dotenv import load_dotenv
 
 from app.database import init_db
+from app.agent.llm import close_bedrock_client
 from app.api.auth import router as auth_router
 from app.api.employee import router as employee_router
 from app.api.agent import router as agent_router
@@ -14,6 +18,22 @@ from fastapi.staticfiles import StaticFiles
 # Load .env file (OPENAI_API_KEY, etc.)
 load_dotenv()
 
+# ------------------------------------------------------------------
+# Lifespan
+# ------------------------------------------------------------------
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create the schema on startup (unless APP_AUTO_CREATE_SCHEMA=0, for
+    deployments that bootstrap the database once, outside the workers)
+    and release the shared Bedrock client on shutdown.
+    """
+    if os.getenv("APP_AUTO_CREATE_SCHEMA", "1") == "1":
+        init_db()
+    yield
+    await close_bedrock_client()
+
 # ------------------------------------------------------------------
 # FastAPI app
 # ------------------------------------------------------------------
@@ -22,21 +42,11 @@ app = FastAPI(
     title="Employee Agent App",
     description="Workday-like employee management app with LangGraph agent",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# ------------------------------------------------------------------
-# Startup
-# ------------------------------------------------------------------
-
-@app.on_event("startup")
-def startup_event():
-    """
-    Initialize database schema on startup.
-    """
-    init_db()
-
 # ------------------------------------------------------------------
 # Routers
 # ------------------------------------------------------------------
@@ -1,7 +1,9 @@
 from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.database import Base
+from app.models.types import SessionId
 
 
 class AgentMessage(Base):
@@ -18,7 +20,7 @@ class AgentMessage(Base):
     # ------------------------------------------------------------------
 
     session_id = Column(
-        String,
+        SessionId,
         ForeignKey("agent_sessions.session_id"),
         nullable=False,
         index=True,
@@ -44,6 +46,12 @@ class AgentMessage(Base):
         server_default=func.now(),
     )
 
+    session = relationship(
+        "AgentSession",
+        back_populates="messages",
+        lazy="raise",
+    )
+
     # ------------------------------------------------------------------
     # Representation helpers
     # ------------------------------------------------------------------
@@ -1,7 +1,11 @@
-from sqlalchemy import Column, String, Boolean, Integer, DateTime, Text
+import orjson
+from sqlalchemy import Column, String, Boolean, Integer, DateTime, Index, Text
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.database import Base
+from app.models.types import SessionId
 
 
 class AgentSession(Base):
@@ -11,7 +15,8 @@ class AgentSession(Base):
     # Session identity
     # ------------------------------------------------------------------
 
-    session_id = Column(String, primary_key=True, index=True)
+    # 16-byte UUID key (see SessionId); exposed as a str
+    session_id = Column(SessionId, primary_key=True, index=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(
@@ -40,6 +45,44 @@ class AgentSession(Base):
         doc="Serialized LangGraph agent state (JSON)",
     )
 
+    # Sub-fields of the state. In SQL they compile to json_extract(), so
+    # SQLite parses the blob in C (and ix_agent_sessions_intent applies);
+    # on an instance they read the loaded text.
+    @hybrid_property
+    def intent(self):
+        return orjson.loads(self.state_json or "{}").get("intent")
+
+    @intent.inplace.expression
+    @classmethod
+    def _intent_expression(cls):
+        return func.json_extract(cls.state_json, "$.intent")
+
+    @hybrid_property
+    def awaiting_confirmation(self):
+        return bool(
+            orjson.loads(self.state_json or "{}").get("awaiting_confirmation")
+        )
+
+    @awaiting_confirmation.inplace.expression
+    @classmethod
+    def _awaiting_confirmation_expression(cls):
+        return func.coalesce(
+            func.json_extract(cls.state_json, "$.awaiting_confirmation"), 0
+        )
+
+    # ------------------------------------------------------------------
+    # Conversation history
+    # ------------------------------------------------------------------
+
+    # lazy="raise": history is never loaded implicitly (no N+1 on the
+    # chat path); callers that need it opt in with selectinload()
+    messages = relationship(
+        "AgentMessage",
+        back_populates="session",
+        order_by="AgentMessage.id",
+        lazy="raise",
+    )
+
     # ------------------------------------------------------------------
     # Representation helpers
     # ------------------------------------------------------------------
@@ -51,3 +94,7 @@ class AgentSession(Base):
             f"employee_id={self.employee_id} "
             f"role={self.role}>"
         )
+
+
+# json_extract() is SQLite's; other backends simply go without the index
+Index("ix_agent_sessions_intent", AgentSession.intent).ddl_if(dialect="sqlite")
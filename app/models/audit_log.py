@@ -0,0 +1,42 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text
+
+from app.database import Base
+from app.models.types import SessionId
+
+
+class AuditLog(Base):
+    __tablename__ = "audit_log"
+
+    # ------------------------------------------------------------------
+    # Primary key
+    # ------------------------------------------------------------------
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # ------------------------------------------------------------------
+    # Event
+    # ------------------------------------------------------------------
+
+    session_id = Column(SessionId, nullable=True, index=True)
+
+    event_type = Column(String, nullable=False)
+
+    details = Column(
+        Text,
+        nullable=False,
+        default="{}",
+        doc="Event details (JSON)",
+    )
+
+    timestamp = Column(DateTime(timezone=True), nullable=False)
+
+    # ------------------------------------------------------------------
+    # Representation helpers
+    # ------------------------------------------------------------------
+
+    def __repr__(self) -> str:
+        return (
+            f"<AuditLog id={self.id} "
+            f"session_id={self.session_id} "
+            f"event_type={self.event_type}>"
+        )
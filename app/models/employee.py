@@ -1,11 +1,24 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from sqlalchemy.orm import backref, relationship
 
 from app.database import Base
 
 
 class Employee(Base):
     __tablename__ = "employees"
+    __table_args__ = (
+        # Login only needs id and role: on PostgreSQL the index covers
+        # them, so the lookup never touches the heap.
+        Index(
+            "ix_employees_email",
+            "email",
+            unique=True,
+            postgresql_include=["id", "role"],
+        ),
+        # "Active reports of manager X"; the leading column also serves
+        # plain manager_id lookups (the self-referential FK).
+        Index("ix_emp_mgr_status", "manager_id", "status"),
+    )
 
     # ------------------------------------------------------------------
     # Core identifiers
@@ -13,7 +26,7 @@ class Employee(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
-    email = Column(String, unique=True, index=True, nullable=False)
+    email = Column(String, nullable=False)
 
     # ------------------------------------------------------------------
     # Role & hierarchy
@@ -22,11 +35,14 @@ class Employee(Base):
     role = Column(String, nullable=False)  # employee | manager | hr
     manager_id = Column(Integer, ForeignKey("employees.id"), nullable=True)
 
-    # Self-referential relationship (manager -> reports)
+    # Self-referential relationship (manager -> reports).
+    # Never lazy-loaded: callers that need the hierarchy must ask for it
+    # with selectinload(), so iterating employees can't turn into N+1.
     manager = relationship(
         "Employee",
         remote_side=[id],
-        backref="reports",
+        backref=backref("reports", lazy="raise"),
+        lazy="raise",
     )
 
     # ------------------------------------------------------------------
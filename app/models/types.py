@@ -0,0 +1,44 @@
+import uuid
+from typing import Any
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.types import BINARY, TypeDecorator
+
+
+class SessionId(TypeDecorator):
+    """
+    A UUID stored compactly: native UUID on PostgreSQL, 16 raw bytes
+    elsewhere (SQLite). Python code keeps seeing the canonical string.
+    """
+
+    impl = BINARY(16)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=True))
+        return dialect.type_descriptor(BINARY(16))
+
+    def process_bind_param(self, value: Any, dialect):
+        if value is None:
+            return None
+        value = value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+        return value if dialect.name == "postgresql" else value.bytes
+
+    def process_result_value(self, value: Any, dialect):
+        if value is None:
+            return None
+        if isinstance(value, uuid.UUID):
+            return str(value)
+        return str(uuid.UUID(bytes=bytes(value)))
+
+
+def is_session_id(value: str) -> bool:
+    """
+    True if `value` parses as a UUID (and can be bound to a SessionId column).
+    """
+    try:
+        uuid.UUID(str(value))
+    except ValueError:
+        return False
+    return True
@@ -1,3 +1,4 @@
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.database import SessionLocal, init_db
@@ -19,7 +20,7 @@ def seed_employees(db: Session):
         # ------------------------------------------------------------------
         # HR users
         # ------------------------------------------------------------------
-        Employee(
+        dict(
             id=1,
             name="Anita Rao",
             email="anita.rao@company.com",
@@ -29,7 +30,7 @@ def seed_employees(db: Session):
             status="active",
             location="Bangalore",
         ),
-        Employee(
+        dict(
             id=2,
             name="Mark Jensen",
             email="mark.jensen@company.com",
@@ -43,7 +44,7 @@ def seed_employees(db: Session):
         # ------------------------------------------------------------------
         # Managers
         # ------------------------------------------------------------------
-        Employee(
+        dict(
             id=3,
             name="Ravi Mehta",
             email="ravi.mehta@company.com",
@@ -53,7 +54,7 @@ def seed_employees(db: Session):
             status="active",
             location="Bangalore",
         ),
-        Employee(
+        dict(
             id=4,
             name="Susan Lee",
             email="susan.lee@company.com",
@@ -63,7 +64,7 @@ def seed_employees(db: Session):
             status="active",
             location="San Francisco",
         ),
-        Employee(
+        dict(
             id=5,
             name="Daniel Kim",
             email="daniel.kim@company.com",
@@ -77,7 +78,7 @@ def seed_employees(db: Session):
         # ------------------------------------------------------------------
         # Employees (reports)
         # ------------------------------------------------------------------
-        Employee(
+        dict(
             id=6,
             name="Priya Nair",
             email="priya.nair@company.com",
@@ -87,7 +88,7 @@ def seed_employees(db: Session):
             status="active",
             location="Bangalore",
         ),
-        Employee(
+        dict(
             id=7,
             name="Arjun Patel",
             email="arjun.patel@company.com",
@@ -97,7 +98,7 @@ def seed_employees(db: Session):
             status="active",
             location="Bangalore",
         ),
-        Employee(
+        dict(
             id=8,
             name="Neha Sharma",
             email="neha.sharma@company.com",
@@ -107,7 +108,7 @@ def seed_employees(db: Session):
             status="active",
             location="San Francisco",
         ),
-        Employee(
+        dict(
             id=9,
             name="Kevin Brown",
             email="kevin.brown@company.com",
@@ -117,7 +118,7 @@ def seed_employees(db: Session):
             status="active",
             location="San Francisco",
         ),
-        Employee(
+        dict(
             id=10,
             name="Emily Chen",
             email="emily.chen@company.com",
@@ -127,7 +128,7 @@ def seed_employees(db: Session):
             status="active",
             location="Seattle",
         ),
-        Employee(
+        dict(
             id=11,
             name="Michael Torres",
             email="michael.torres@company.com",
@@ -141,7 +142,7 @@ def seed_employees(db: Session):
         # ------------------------------------------------------------------
         # Terminated employee (edge case)
         # ------------------------------------------------------------------
-        Employee(
+        dict(
             id=12,
             name="John Miller",
             email="john.miller@company.com",
@@ -153,7 +154,8 @@ def seed_employees(db: Session):
         ),
     ]
 
-    db.add_all(employees)
+    # One executemany INSERT; no ORM objects or unit-of-work bookkeeping
+    db.execute(insert(Employee), employees)
     db.commit()
     print(f"Seeded {len(employees)} employees.")
 
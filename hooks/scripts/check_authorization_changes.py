@@ -15,14 +15,146 @@ Unlike regex-based approaches, AST parsing:
 
 import argparse
 import ast
+import functools
+import hashlib
+import io
+import os
+import pickle
+import re
 import sys
+import tempfile
+from bisect import bisect_left
 from pathlib import Path
-from typing import List, Set, Tuple, Dict, Optional
+from typing import Iterable, List, Set, Dict, Optional
 import subprocess
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 
 
-@dataclass
+# Opt-in parse cache: AUTH_HOOK_AST_CACHE=1 keeps pickled trees between
+# pre-commit runs, keyed by source hash and interpreter version.
+AST_CACHE_ENABLED = os.environ.get('AUTH_HOOK_AST_CACHE') == '1'
+AST_CACHE_DIR = Path(
+    os.environ.get('AUTH_HOOK_AST_CACHE_DIR', '.git/hooks/ast-cache')
+)
+
+
+def _cached_parse(path: str, source: str) -> ast.Module:
+    """Parse `source`, reusing a cached tree for identical content."""
+    if not AST_CACHE_ENABLED:
+        return ast.parse(source, filename=path)
+
+    digest = hashlib.sha256(source.encode()).hexdigest()
+    version = f"{sys.version_info.major}{sys.version_info.minor}"
+    cache_file = AST_CACHE_DIR / f"{digest}-py{version}.pkl"
+
+    try:
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+
+    tree = ast.parse(source, filename=path)
+    try:
+        AST_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=AST_CACHE_DIR, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(tree, f, protocol=5)
+        os.replace(tmp, cache_file)  # atomic: readers never see a partial file
+    except OSError:
+        pass  # caching is best-effort
+    return tree
+
+
+# Optional path allowlist. When AUTH_HOOK_PATHS is set (comma-separated
+# prefixes, e.g. "app/agent/,app/api/"), only files under those prefixes
+# or with an auth-related name are analyzed. Unset = every file, since
+# role checks can live anywhere.
+AUTH_HOOK_PATHS = tuple(
+    prefix.strip()
+    for prefix in os.environ.get('AUTH_HOOK_PATHS', '').split(',')
+    if prefix.strip()
+)
+_AUTH_PATH_KEYWORDS = ('auth', 'rbac', 'permission', 'role', 'rule')
+
+
+def _is_auth_candidate_path(file_path: str) -> bool:
+    """Check a staged path against the AUTH_HOOK_PATHS allowlist."""
+    if not AUTH_HOOK_PATHS:
+        return True
+    path = Path(file_path).as_posix()
+    if path.startswith(AUTH_HOOK_PATHS):
+        return True
+    lowered = path.lower()
+    return any(keyword in lowered for keyword in _AUTH_PATH_KEYWORDS)
+
+
+# test/ or tests/ directories, test_*.py and *_test.py files. Matched on
+# path components, so e.g. app/latest_report.py is not mistaken for a test.
+_TEST_PATH_RE = re.compile(r'(?:^|/)tests?/|(?:^|/)test_[^/]*\.py$|_test\.py$')
+
+
+# Cheap prescreen: a file whose lowercased bytes contain none of these
+# cannot produce a pattern (function names, state.role/authenticated,
+# PermissionError, `action in`, role literals), so it is never parsed.
+_MARKERS = (
+    b'authorize', b'permission', b'check_auth', b'verify_access', b'role',
+    b'authenticated', b'action', b'employee', b'manager', b'admin',
+    b"'hr'", b'"hr"',
+)
+
+
+def _may_contain_patterns(data: bytes) -> bool:
+    lowered = data.lower()
+    return any(marker in lowered for marker in _MARKERS)
+
+
+# New-side start/count of a unified-diff hunk header
+_HUNK_RE = re.compile(r'^@@ -\S+ \+(\d+)(?:,(\d+))? @@')
+
+
+def _unquote_path(path: str) -> str:
+    """Undo git's C-style quoting of unusual paths in diff headers."""
+    if path.startswith('"'):
+        return ast.literal_eval('b' + path).decode('utf-8')
+    return path
+
+
+def _parse_changed_lines(diff_lines: Iterable[str]) -> Dict[str, Set[int]]:
+    """Map each file in a --unified=0 diff to its added/changed line numbers."""
+    changed: Dict[str, Set[int]] = {}
+    current: Optional[Set[int]] = None
+    in_header = False
+
+    for line in diff_lines:
+        # Branch on the first character, so content lines (the bulk of a
+        # --unified=0 diff) never reach a startswith() call
+        first = line[:1]
+        if first == '+':
+            # Only header lines: an added line can start with "++ " too
+            if in_header and line.startswith('+++ '):
+                # Quoted if unusual (non-ASCII...), tab-terminated if it
+                # contains a space
+                path = _unquote_path(line[4:].rstrip('\n').rstrip('\t'))
+                if path.startswith('b/'):
+                    current = changed.setdefault(path[2:], set())
+                else:
+                    current = None  # /dev/null: file deleted
+        elif first == 'd':
+            if line.startswith('diff --git '):
+                in_header, current = True, None
+        elif first == '@' and current is not None:
+            in_header = False
+            match = _HUNK_RE.match(line)
+            if match:
+                start = int(match.group(1))
+                count = int(match.group(2)) if match.group(2) is not None else 1
+                current.update(range(start, start + count))
+
+    return changed
+
+
+@dataclass(slots=True, frozen=True)
 class AuthorizationPattern:
     """Represents an authorization-related code pattern."""
     file_path: str
@@ -32,7 +164,19 @@ class AuthorizationPattern:
     node_type: str
 
 
-class AuthorizationASTVisitor(ast.NodeVisitor):
+# Substrings that mark a function as authorization logic (matched
+# against the lowercased name)
+AUTH_FUNCTION_NAMES = (
+    'authorize', 'check_permission', 'check_auth',
+    'verify_access', 'validate_role', 'check_role',
+    'authorize_action', 'require_role', 'has_permission'
+)
+
+# String literals that make a comparison a role check
+ROLE_VALUES = frozenset({'employee', 'manager', 'hr', 'admin'})
+
+
+class AuthorizationASTVisitor:
     """
     AST visitor that identifies authorization-related code patterns.
 
@@ -42,30 +186,65 @@ class AuthorizationASTVisitor(ast.NodeVisitor):
     3. Permission errors being raised
     4. Action whitelist checks
     5. Authorization functions
+
+    Traversal is one flat walk with a per-node-type dispatch table
+    (see _HANDLERS below) rather than NodeVisitor's recursive
+    generic_visit. Patterns are returned in line order, without repeats.
+
+    With `changed_lines`, only nodes starting on those lines are
+    inspected (every pattern is reported at its node's line), and
+    subtrees whose source span holds no changed line are not entered.
     """
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, changed_lines: Optional[Set[int]] = None):
         self.file_path = file_path
+        self.changed_lines = changed_lines
         self.patterns: List[AuthorizationPattern] = []
-        self.in_auth_function = False
-        self.current_function = None
 
-    def visit_FunctionDef(self, node: ast.FunctionDef):
-        """Track functions, especially authorization-related ones."""
-        old_function = self.current_function
-        old_in_auth = self.in_auth_function
+    def visit(self, tree: ast.AST):
+        """Collect patterns from every node of `tree`."""
+        handlers = _HANDLERS
+        changed = self.changed_lines
+        if changed is None:
+            for node in ast.walk(tree):
+                handler = handlers.get(type(node))
+                if handler is not None:
+                    handler(self, node)
+        else:
+            self._visit_changed(tree, changed)
+        # Patterns are frozen (hashable): drop exact repeats, e.g. two
+        # state.role reads on one line, so each is diff-checked once
+        self.patterns = sorted(
+            dict.fromkeys(self.patterns), key=lambda p: p.line_number
+        )
 
-        self.current_function = node.name
+    def _visit_changed(self, tree: ast.AST, changed: Set[int]):
+        """Visit only the parts of `tree` whose lines overlap `changed`."""
+        handlers = _HANDLERS
+        ordered = sorted(changed)
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            end = getattr(node, 'end_lineno', None)
+            if end is not None:
+                # Decorators sit above a def/class's own line
+                start = node.lineno
+                decorators = getattr(node, 'decorator_list', None)
+                if decorators:
+                    start = min(start, decorators[0].lineno)
+                i = bisect_left(ordered, start)
+                if i == len(ordered) or ordered[i] > end:
+                    continue  # nothing below here starts on a changed line
+                handler = handlers.get(type(node))
+                if handler is not None and node.lineno in changed:
+                    handler(self, node)
+            stack.extend(ast.iter_child_nodes(node))
 
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        """Flag authorization-related functions."""
         # Detect authorization functions by name
-        auth_function_names = [
-            'authorize', 'check_permission', 'check_auth',
-            'verify_access', 'validate_role', 'check_role',
-            'authorize_action', 'require_role', 'has_permission'
-        ]
-
-        if any(auth_name in node.name.lower() for auth_name in auth_function_names):
-            self.in_auth_function = True
+        name = node.name.lower()
+        if any(auth_name in name for auth_name in AUTH_FUNCTION_NAMES):
             self.patterns.append(AuthorizationPattern(
                 file_path=self.file_path,
                 line_number=node.lineno,
@@ -74,15 +253,10 @@ class AuthorizationASTVisitor(ast.NodeVisitor):
                 node_type="FunctionDef"
             ))
 
-        self.generic_visit(node)
-
-        self.current_function = old_function
-        self.in_auth_function = old_in_auth
-
     def visit_Attribute(self, node: ast.Attribute):
         """Detect attribute accesses like state.role, state.authenticated."""
         # Check for state.role or state.authenticated
-        if isinstance(node.value, ast.Name):
+        if type(node.value) is ast.Name:
             if node.value.id == 'state' and node.attr in ('role', 'authenticated'):
                 self.patterns.append(AuthorizationPattern(
                     file_path=self.file_path,
@@ -92,17 +266,12 @@ class AuthorizationASTVisitor(ast.NodeVisitor):
                     node_type="Attribute"
                 ))
 
-        self.generic_visit(node)
-
     def visit_Compare(self, node: ast.Compare):
         """Detect comparison operations, especially role checks."""
-        # Check if we're comparing against role strings
-        role_values = {'employee', 'manager', 'hr', 'admin'}
-
         # Check comparators for role values
         for comparator in node.comparators:
-            if isinstance(comparator, ast.Constant):
-                if comparator.value in role_values:
+            if type(comparator) is ast.Constant:
+                if comparator.value in ROLE_VALUES:
                     self.patterns.append(AuthorizationPattern(
                         file_path=self.file_path,
                         line_number=node.lineno,
@@ -112,8 +281,8 @@ class AuthorizationASTVisitor(ast.NodeVisitor):
                     ))
 
         # Check for state.role comparisons
-        if isinstance(node.left, ast.Attribute):
-            if (isinstance(node.left.value, ast.Name) and
+        if type(node.left) is ast.Attribute:
+            if (type(node.left.value) is ast.Name and
                 node.left.value.id == 'state' and
                 node.left.attr == 'role'):
                 self.patterns.append(AuthorizationPattern(
@@ -124,18 +293,16 @@ class AuthorizationASTVisitor(ast.NodeVisitor):
                     node_type="Compare"
                 ))
 
-        self.generic_visit(node)
-
     def visit_Raise(self, node: ast.Raise):
         """Detect PermissionError raises."""
         if node.exc:
             # Check if raising PermissionError
-            if isinstance(node.exc, ast.Call):
-                if isinstance(node.exc.func, ast.Name):
+            if type(node.exc) is ast.Call:
+                if type(node.exc.func) is ast.Name:
                     if node.exc.func.id == 'PermissionError':
                         # Extract error message if available
                         msg = "Unknown"
-                        if node.exc.args and isinstance(node.exc.args[0], ast.Constant):
+                        if node.exc.args and type(node.exc.args[0]) is ast.Constant:
                             msg = node.exc.args[0].value
 
                         self.patterns.append(AuthorizationPattern(
@@ -146,16 +313,14 @@ class AuthorizationASTVisitor(ast.NodeVisitor):
                             node_type="Raise"
                         ))
 
-        self.generic_visit(node)
-
     def visit_If(self, node: ast.If):
         """Detect if statements that check authentication or roles."""
         # Check for authentication checks
-        if isinstance(node.test, ast.UnaryOp):
-            if isinstance(node.test.op, ast.Not):
+        if type(node.test) is ast.UnaryOp:
+            if type(node.test.op) is ast.Not:
                 # Check for "if not state.authenticated"
-                if isinstance(node.test.operand, ast.Attribute):
-                    if (isinstance(node.test.operand.value, ast.Name) and
+                if type(node.test.operand) is ast.Attribute:
+                    if (type(node.test.operand.value) is ast.Name and
                         node.test.operand.value.id == 'state' and
                         node.test.operand.attr == 'authenticated'):
                         self.patterns.append(AuthorizationPattern(
@@ -167,8 +332,8 @@ class AuthorizationASTVisitor(ast.NodeVisitor):
                         ))
 
         # Check for "if state.authenticated"
-        if isinstance(node.test, ast.Attribute):
-            if (isinstance(node.test.value, ast.Name) and
+        if type(node.test) is ast.Attribute:
+            if (type(node.test.value) is ast.Name and
                 node.test.value.id == 'state' and
                 node.test.attr == 'authenticated'):
                 self.patterns.append(AuthorizationPattern(
@@ -180,10 +345,10 @@ class AuthorizationASTVisitor(ast.NodeVisitor):
                 ))
 
         # Check for action whitelist checks (if action in (...))
-        if isinstance(node.test, ast.Compare):
+        if type(node.test) is ast.Compare:
             for op in node.test.ops:
-                if isinstance(op, (ast.In, ast.NotIn)):
-                    if isinstance(node.test.left, ast.Name):
+                if type(op) is ast.In or type(op) is ast.NotIn:
+                    if type(node.test.left) is ast.Name:
                         if node.test.left.id == 'action':
                             self.patterns.append(AuthorizationPattern(
                                 file_path=self.file_path,
@@ -193,7 +358,47 @@ class AuthorizationASTVisitor(ast.NodeVisitor):
                                 node_type="If"
                             ))
 
-        self.generic_visit(node)
+
+_HANDLERS = {
+    ast.FunctionDef: AuthorizationASTVisitor.visit_FunctionDef,
+    ast.Attribute: AuthorizationASTVisitor.visit_Attribute,
+    ast.Compare: AuthorizationASTVisitor.visit_Compare,
+    ast.Raise: AuthorizationASTVisitor.visit_Raise,
+    ast.If: AuthorizationASTVisitor.visit_If,
+}
+
+
+def _analyze_file(
+    file_path: str, changed_lines: Optional[Set[int]] = None
+) -> List[AuthorizationPattern]:
+    """Analyze a file using AST to find authorization patterns."""
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+
+        if not _may_contain_patterns(data):
+            return []
+        source_code = data.decode()
+
+        # Parse the file into an AST
+        tree = _cached_parse(file_path, source_code)
+
+        # Visit the AST to find authorization patterns
+        visitor = AuthorizationASTVisitor(file_path, changed_lines)
+        visitor.visit(tree)
+
+        return visitor.patterns
+
+    except SyntaxError as e:
+        print(f"Warning: Syntax error in {file_path}: {e}")
+        return []
+    except Exception as e:
+        print(f"Warning: Could not analyze {file_path}: {e}")
+        return []
+
+
+# Below this many candidate files a process pool costs more than it saves
+PARALLEL_MIN_FILES = 5
 
 
 class AuthorizationChangeDetector:
@@ -201,108 +406,83 @@ class AuthorizationChangeDetector:
 
     def __init__(self, files: List[str]):
         self.files = files
-        self.violations: List[Tuple[str, str, int]] = []
+        self.violations: List[AuthorizationPattern] = []
         self.auth_patterns: Dict[str, List[AuthorizationPattern]] = {}
+        # Staged diff, fetched once per run (None = diff unavailable)
+        self._changed_lines: Optional[Dict[str, Set[int]]] = None
+        self._auth_tests_updated = False
 
     def run(self) -> int:
         """Run the detector on staged files."""
+        self._load_staged_diff()
+
+        candidates: List[str] = []
+        line_sets: List[Optional[Set[int]]] = []
         for file_path in self.files:
             if not file_path.endswith('.py'):
                 continue
-
-            # Skip test files
-            if self._is_test_file(file_path):
+            if self._is_test_file(file_path):  # Skip test files
                 continue
-
-            # Analyze the file for authorization patterns
-            patterns = self._analyze_file(file_path)
-
+            if not _is_auth_candidate_path(file_path):
+                continue
+            lines = self._changed_lines_for(file_path)
+            if lines is not None and not lines:
+                continue  # nothing staged in this file: no need to parse it
+            candidates.append(file_path)
+            line_sets.append(lines)
+
+        # Analyze only the changed lines of each file (CPU-bound and
+        # independent per file, so large commits fan out across cores)
+        if len(candidates) >= PARALLEL_MIN_FILES:
+            with ProcessPoolExecutor() as executor:
+                results = list(
+                    executor.map(_analyze_file, candidates, line_sets, chunksize=8)
+                )
+        else:
+            results = list(map(_analyze_file, candidates, line_sets))
+
+        for file_path, patterns in zip(candidates, results):
             if patterns:
                 self.auth_patterns[file_path] = patterns
 
                 # Check if authorization tests were updated
-                if not self._has_updated_auth_tests():
-                    for pattern in patterns:
-                        # Check if this pattern is in changed lines
-                        if self._is_line_changed(file_path, pattern.line_number):
-                            self.violations.append((
-                                file_path,
-                                f"{pattern.pattern_type}: {pattern.context}",
-                                pattern.line_number
-                            ))
+                if not self._auth_tests_updated:
+                    self.violations.extend(patterns)
 
         return self._report_violations()
 
     def _is_test_file(self, file_path: str) -> bool:
         """Check if file is a test file."""
-        return 'test_' in file_path or '/tests/' in file_path
-
-    def _analyze_file(self, file_path: str) -> List[AuthorizationPattern]:
-        """Analyze a file using AST to find authorization patterns."""
-        try:
-            with open(file_path, 'r') as f:
-                source_code = f.read()
-
-            # Parse the file into an AST
-            tree = ast.parse(source_code, filename=file_path)
-
-            # Visit the AST to find authorization patterns
-            visitor = AuthorizationASTVisitor(file_path)
-            visitor.visit(tree)
-
-            return visitor.patterns
-
-        except SyntaxError as e:
-            print(f"Warning: Syntax error in {file_path}: {e}")
-            return []
-        except Exception as e:
-            print(f"Warning: Could not analyze {file_path}: {e}")
-            return []
+        return _TEST_PATH_RE.search(Path(file_path).as_posix()) is not None
 
-    def _is_line_changed(self, file_path: str, line_number: int) -> bool:
-        """Check if a specific line was changed in the staged diff."""
+    def _load_staged_diff(self):
+        """Read the whole staged diff and staged file list in two git calls."""
+        # Streamed: the diff is parsed as git produces it, never held whole
         try:
-            result = subprocess.run(
-                ['git', 'diff', '--cached', '--unified=0', file_path],
-                capture_output=True,
+            with subprocess.Popen(
+                # Fixed a/ b/ prefixes whatever diff.noprefix etc. say
+                ['git', 'diff', '--cached', '--unified=0', '--no-color',
+                 '--no-ext-diff', '--src-prefix=a/', '--dst-prefix=b/', '--'],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 text=True,
-                check=True
-            )
-
-            current_line = 0
-            in_change_block = False
-
-            for line in result.stdout.split('\n'):
-                # Parse unified diff format
-                if line.startswith('@@'):
-                    # Extract the new file line numbers
-                    import re
-                    match = re.search(r'\+(\d+),?(\d+)?', line)
-                    if match:
-                        start = int(match.group(1))
-                        count = int(match.group(2)) if match.group(2) else 1
-
-                        # Check if our line is in this change block
-                        if start <= line_number < start + count:
-                            return True
-
-                        current_line = start
-                        in_change_block = True
-                elif line.startswith('+') and not line.startswith('+++'):
-                    if in_change_block and current_line == line_number:
-                        return True
-                    current_line += 1
-                elif line.startswith('-') and not line.startswith('---'):
-                    # Line was removed, don't increment counter
-                    pass
-                elif in_change_block and not line.startswith('\\'):
-                    current_line += 1
-
-            return False
-
-        except subprocess.CalledProcessError:
-            # File might be newly added, consider all lines changed
-            return True
+                errors='replace',  # one undecodable file must not sink the rest
+            ) as proc:
+                changed = _parse_changed_lines(proc.stdout)
+            self._changed_lines = changed if proc.returncode == 0 else None
+        except OSError:
+            self._changed_lines = None
+
+        self._auth_tests_updated = self._has_updated_auth_tests()
+
+    def _changed_lines_for(self, file_path: str) -> Optional[Set[int]]:
+        """Staged line numbers of a file (None = treat every line as changed)."""
+        if self._changed_lines is None:
+            # No diff available: consider all lines changed
+            return None
+        # A staged file missing from the diff (e.g. a header the parser
+        # did not understand) is checked in full, never skipped
+        return self._changed_lines.get(Path(file_path).as_posix())
 
     def _has_updated_auth_tests(self) -> bool:
         """Check if authorization test files were updated in this commit."""
@@ -343,38 +523,43 @@ class AuthorizationChangeDetector:
                 print("✓ No authorization logic changes detected")
             return 0
 
-        print("\n" + "=" * 80)
-        print("⚠️  AUTHORIZATION LOGIC CHANGES WITHOUT TEST UPDATES")
-        print("=" * 80)
-        print("\nThe following authorization logic was changed without updating")
-        print("authorization tests:\n")
+        # The report is assembled in memory and written in one call
+        out = io.StringIO()
+        emit = functools.partial(print, file=out)
+
+        emit("\n" + "=" * 80)
+        emit("⚠️  AUTHORIZATION LOGIC CHANGES WITHOUT TEST UPDATES")
+        emit("=" * 80)
+        emit("\nThe following authorization logic was changed without updating")
+        emit("authorization tests:\n")
 
         # Group violations by file
-        violations_by_file: Dict[str, List[Tuple[str, int]]] = {}
-        for file_path, message, line_num in self.violations:
-            if file_path not in violations_by_file:
-                violations_by_file[file_path] = []
-            violations_by_file[file_path].append((message, line_num))
+        violations_by_file: Dict[str, List[AuthorizationPattern]] = {}
+        for pattern in self.violations:
+            violations_by_file.setdefault(pattern.file_path, []).append(pattern)
 
         for file_path, violations in violations_by_file.items():
-            print(f"  {file_path}")
-            for message, line_num in violations:
-                print(f"    Line {line_num}: {message}")
-            print()
-
-        print("=" * 80)
-        print("AUTHORIZATION PATTERNS DETECTED:")
-        print("=" * 80)
-
-        pattern_types = set(v[1].split(':')[0] for v in self.violations)
-        print("\nThis commit modifies:")
+            emit(f"  {file_path}")
+            for pattern in violations:
+                emit(
+                    f"    Line {pattern.line_number}: "
+                    f"{pattern.pattern_type}: {pattern.context}"
+                )
+            emit()
+
+        emit("=" * 80)
+        emit("AUTHORIZATION PATTERNS DETECTED:")
+        emit("=" * 80)
+
+        pattern_types = {pattern.pattern_type for pattern in self.violations}
+        emit("\nThis commit modifies:")
         for pattern in sorted(pattern_types):
-            print(f"  • {pattern.replace('_', ' ').title()}")
+            emit(f"  • {pattern.replace('_', ' ').title()}")
 
-        print("\n" + "=" * 80)
-        print("REMEDIATION:")
-        print("=" * 80)
-        print("""
+        emit("\n" + "=" * 80)
+        emit("REMEDIATION:")
+        emit("=" * 80)
+        emit("""
 1. Update authorization tests in tests/test_authorization_rbac.py
 
 2. Ensure tests cover the changed authorization logic:
@@ -415,7 +600,9 @@ Example test structure:
 To bypass this check (NOT RECOMMENDED):
   git commit --no-verify
 """)
-        print("=" * 80 + "\n")
+        emit("=" * 80 + "\n")
+
+        sys.stdout.write(out.getvalue())
 
         return 1
 
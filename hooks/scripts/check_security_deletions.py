@@ -14,16 +14,72 @@ Uses AST parsing for accuracy and git diff analysis to track deletions.
 
 import argparse
 import ast
+import hashlib
+import os
+import pickle
 import re
 import sys
 import subprocess
+import tempfile
 from pathlib import Path
-from typing import List, Set, Tuple, Dict, Optional
+from typing import Iterable, List, Set, Tuple, Dict, Optional
 from dataclasses import dataclass
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+# Opt-in pattern cache: SECURITY_HOOK_CACHE=1 keeps the patterns found in
+# each old file version between runs (rebase/amend re-check the same blobs).
+# Entries are keyed by content and by this script, so edits to either miss.
+PATTERN_CACHE_ENABLED = os.environ.get('SECURITY_HOOK_CACHE') == '1'
+PATTERN_CACHE_DIR = Path(
+    os.environ.get('SECURITY_HOOK_CACHE_DIR', '.git/hooks-cache/security-patterns')
+)
+
+# Function names (lowercased) that mark validation or authorization code.
+# A validation function names both a verb and what it checks, in any order.
+VALIDATION_KEYWORDS = (
+    'validate', 'sanitize', 'check', 'verify',
+    'clean', 'escape', 'filter', 'parse'
+)
+VALIDATION_TERMS = ('input', 'data', 'param', 'arg', 'value')
+AUTH_KEYWORDS = ('authorize', 'check_permission', 'require_role', 'has_permission')
+
+_VALIDATION_FUNC_RE = re.compile(
+    f"(?=.*(?:{'|'.join(VALIDATION_KEYWORDS)}))(?=.*(?:{'|'.join(VALIDATION_TERMS)}))",
+    re.DOTALL
+)
+_AUTH_FUNC_RE = re.compile('|'.join(AUTH_KEYWORDS))
+
+# Called names that mark audit logging (exact) or rate limiting (substring,
+# any case)
+AUDIT_FUNCTIONS = frozenset({'log_event', 'log_execution', 'log_audit', 'audit_log'})
+_RATE_LIMIT_RE = re.compile('limit|throttle', re.IGNORECASE)
+
+# Old-side start of a unified-diff hunk header
+_HUNK_RE = re.compile(r'^@@ -(\d+)(?:,\d+)? ')
+
+# Regex fallback for files that fail to parse: (pattern, type, severity)
+SECURITY_REGEXES = tuple(
+    (re.compile(regex), pattern_type, severity)
+    for regex, pattern_type, severity in (
+        (r'log_event|log_execution|log_audit', 'audit_logging', 'high'),
+        (r'raise\s+PermissionError', 'authorization_check', 'critical'),
+        (r'if\s+not\s+.*\.authenticated', 'authentication_check', 'critical'),
+        (r'if\s+.*\.role\s*==', 'authorization_check', 'critical'),
+        (r'@.*limiter|@rate_limit', 'rate_limiting', 'high'),
+        (r'def\s+validate_|def\s+sanitize_', 'input_validation', 'high'),
+        (r'HTTPException', 'error_handling', 'medium'),
+        (r'try:', 'error_handling', 'medium'),
+    )
+)
+
+# Matches a line if any of the above would
+_ANY_SECURITY_RE = re.compile('|'.join(
+    f'(?:{regex.pattern})' for regex, _, _ in SECURITY_REGEXES
+))
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SecurityPattern:
     """Represents a security-relevant code pattern."""
     line_number: int
@@ -33,7 +89,7 @@ class SecurityPattern:
     severity: str  # 'critical', 'high', 'medium'
 
 
-class SecurityASTAnalyzer(ast.NodeVisitor):
+class SecurityASTAnalyzer:
     """
     AST analyzer that identifies security-relevant code patterns.
 
@@ -44,35 +100,57 @@ class SecurityASTAnalyzer(ast.NodeVisitor):
     4. Audit logging calls
     5. Rate limiting
     6. Error handling
+
+    Traversal is an iterative pre-order walk with a per-node-type dispatch
+    table (see _HANDLERS below) rather than NodeVisitor's recursive
+    generic_visit; nodes are visited in the same order as before.
     """
 
     def __init__(self, source_lines: List[str]):
         self.source_lines = source_lines
         self.security_patterns: Dict[int, List[SecurityPattern]] = defaultdict(list)
+        self._stripped: Dict[int, str] = {}
+
+    def visit(self, tree: ast.AST):
+        """Collect patterns from every node of `tree`."""
+        handlers = _HANDLERS
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            handler = handlers.get(type(node))
+            if handler is not None:
+                handler(self, node)
+            # ast.iter_child_nodes inlined: it stacks two generators per
+            # node, which is most of the traversal cost
+            children = []
+            for name in node._fields:
+                value = getattr(node, name, None)
+                if isinstance(value, list):
+                    for item in value:
+                        if isinstance(item, ast.AST):
+                            children.append(item)
+                elif isinstance(value, ast.AST):
+                    children.append(value)
+            # Reversed so the first child is popped (visited) first
+            children.reverse()
+            stack.extend(children)
 
     def visit_FunctionDef(self, node: ast.FunctionDef):
         """Detect security-related functions."""
         func_name = node.name.lower()
 
         # Input validation functions
-        validation_keywords = [
-            'validate', 'sanitize', 'check', 'verify',
-            'clean', 'escape', 'filter', 'parse'
-        ]
-
-        if any(keyword in func_name for keyword in validation_keywords):
-            if any(term in func_name for term in ['input', 'data', 'param', 'arg', 'value']):
-                self.security_patterns[node.lineno].append(SecurityPattern(
-                    line_number=node.lineno,
-                    pattern_type="input_validation",
-                    code_snippet=self._get_line(node.lineno),
-                    context=f"Input validation function: {node.name}",
-                    severity="high"
-                ))
+        if _VALIDATION_FUNC_RE.match(func_name):
+            self.security_patterns[node.lineno].append(SecurityPattern(
+                line_number=node.lineno,
+                pattern_type="input_validation",
+                code_snippet=self._get_line(node.lineno),
+                context=f"Input validation function: {node.name}",
+                severity="high"
+            ))
 
         # Authorization functions
-        auth_keywords = ['authorize', 'check_permission', 'require_role', 'has_permission']
-        if any(keyword in func_name for keyword in auth_keywords):
+        if _AUTH_FUNC_RE.search(func_name):
             self.security_patterns[node.lineno].append(SecurityPattern(
                 line_number=node.lineno,
                 pattern_type="authorization_function",
@@ -81,15 +159,13 @@ class SecurityASTAnalyzer(ast.NodeVisitor):
                 severity="critical"
             ))
 
-        self.generic_visit(node)
-
     def visit_Call(self, node: ast.Call):
         """Detect security-relevant function calls."""
         func_name = self._get_call_name(node)
 
         if func_name:
             # Audit logging calls
-            if func_name in ['log_event', 'log_execution', 'log_audit', 'audit_log']:
+            if func_name in AUDIT_FUNCTIONS:
                 self.security_patterns[node.lineno].append(SecurityPattern(
                     line_number=node.lineno,
                     pattern_type="audit_logging",
@@ -99,7 +175,7 @@ class SecurityASTAnalyzer(ast.NodeVisitor):
                 ))
 
             # Rate limiting
-            elif 'limit' in func_name.lower() or 'throttle' in func_name.lower():
+            elif _RATE_LIMIT_RE.search(func_name):
                 self.security_patterns[node.lineno].append(SecurityPattern(
                     line_number=node.lineno,
                     pattern_type="rate_limiting",
@@ -118,8 +194,6 @@ class SecurityASTAnalyzer(ast.NodeVisitor):
                     severity="medium"
                 ))
 
-        self.generic_visit(node)
-
     def visit_Raise(self, node: ast.Raise):
         """Detect security-related exceptions."""
         if node.exc:
@@ -152,8 +226,6 @@ class SecurityASTAnalyzer(ast.NodeVisitor):
                         severity="high"
                     ))
 
-        self.generic_visit(node)
-
     def visit_If(self, node: ast.If):
         """Detect security-relevant conditional checks."""
         # Authentication checks
@@ -187,8 +259,6 @@ class SecurityASTAnalyzer(ast.NodeVisitor):
                     severity="medium"
                 ))
 
-        self.generic_visit(node)
-
     def visit_Try(self, node: ast.Try):
         """Detect try/except blocks (error handling)."""
         if node.handlers:
@@ -203,8 +273,6 @@ class SecurityASTAnalyzer(ast.NodeVisitor):
                     ))
                     break
 
-        self.generic_visit(node)
-
     def _is_auth_check(self, node: ast.expr) -> bool:
         """Check if node is an authentication check."""
         # if not state.authenticated
@@ -235,17 +303,98 @@ class SecurityASTAnalyzer(ast.NodeVisitor):
 
     def _get_call_name(self, node: ast.Call) -> Optional[str]:
         """Extract function name from Call node."""
-        if isinstance(node.func, ast.Name):
-            return node.func.id
-        elif isinstance(node.func, ast.Attribute):
-            return node.func.attr
-        return None
+        # Only Name has .id and only Attribute has .attr among call targets
+        func = node.func
+        return getattr(func, 'id', None) or getattr(func, 'attr', None)
 
     def _get_line(self, line_num: int) -> str:
-        """Get source line by number."""
-        if 1 <= line_num <= len(self.source_lines):
-            return self.source_lines[line_num - 1].strip()
-        return ""
+        """Get source line by number (stripped once, however many patterns hit it)."""
+        line = self._stripped.get(line_num)
+        if line is None:
+            if 1 <= line_num <= len(self.source_lines):
+                line = self.source_lines[line_num - 1].strip()
+            else:
+                line = ""
+            self._stripped[line_num] = line
+        return line
+
+
+_HANDLERS = {
+    ast.FunctionDef: SecurityASTAnalyzer.visit_FunctionDef,
+    ast.Call: SecurityASTAnalyzer.visit_Call,
+    ast.Raise: SecurityASTAnalyzer.visit_Raise,
+    ast.If: SecurityASTAnalyzer.visit_If,
+    ast.Try: SecurityASTAnalyzer.visit_Try,
+}
+
+
+def _unquote_path(path: str) -> str:
+    """Undo git's C-style quoting of unusual paths in diff headers."""
+    if path.startswith('"'):
+        return ast.literal_eval('b' + path).decode('utf-8')
+    return path
+
+
+def _parse_deleted_lines(diff_lines: Iterable[str]) -> Dict[str, Set[int]]:
+    """Map each file in a --unified=0 diff to its deleted (old-side) line numbers."""
+    deleted: Dict[str, Set[int]] = {}
+    current: Optional[Set[int]] = None
+    in_header = False
+    line_num = 0
+
+    for line in diff_lines:
+        # Branch on the first character; a deleted line can itself start
+        # with "--", so "--- " only counts inside a file header
+        first = line[:1]
+        if first == '-':
+            if current is not None and not in_header:
+                current.add(line_num)
+                line_num += 1
+        elif first == '+':
+            if in_header and line.startswith('+++ '):
+                # Deleted files (+++ /dev/null) are not analyzed
+                path = _unquote_path(line[4:].rstrip('\n').rstrip('\t'))
+                current = deleted.setdefault(path[2:], set()) if path.startswith('b/') else None
+        elif first == 'd':
+            if line.startswith('diff --git '):
+                in_header, current = True, None
+        elif first == '@' and current is not None:
+            in_header = False
+            match = _HUNK_RE.match(line)
+            if match:
+                line_num = int(match.group(1))
+
+    return deleted
+
+
+_fingerprint: Optional[bytes] = None
+
+
+def _hook_fingerprint() -> bytes:
+    """Digest of this script, so cached patterns die with detector changes."""
+    global _fingerprint
+    if _fingerprint is None:
+        _fingerprint = hashlib.sha256(Path(__file__).read_bytes()).digest()
+    return _fingerprint
+
+
+# What deleting each kind of pattern means, in report order
+IMPLICATIONS = {
+    'audit_logging': '• Reduced audit trail - security events may go unlogged',
+    'authentication_check': '• Weakened authentication - unauthorized access possible',
+    'authorization_check': '• Bypassed authorization - privilege escalation risk',
+    'input_validation': '• Missing input validation - injection attacks possible',
+    'rate_limiting': '• Removed rate limiting - DoS/brute force attacks easier',
+    'error_handling': '• Poor error handling - information leakage risk',
+    'defensive_check': '• Missing defensive checks - potential crashes/errors'
+}
+
+# Files never analyzed: any path containing one of these
+EXCLUDED_SUBSTRINGS = ('test_', '/tests/', '__init__.py', 'conftest.py')
+_EXCLUDED_RE = re.compile('|'.join(map(re.escape, EXCLUDED_SUBSTRINGS)))
+
+# Below this many files to analyze a process pool costs more than it saves
+PARALLEL_MIN_FILES = 5
 
 
 class SecurityDeletionDetector:
@@ -257,84 +406,162 @@ class SecurityDeletionDetector:
 
     def run(self) -> int:
         """Run the detector on staged files."""
-        for file_path in self.files:
-            if not file_path.endswith('.py'):
-                continue
+        candidates = [
+            os.path.normpath(file_path)
+            for file_path in self.files
+            if file_path.endswith('.py') and not self._is_excluded_file(file_path)
+        ]
 
-            if self._is_excluded_file(file_path):
-                continue
+        if candidates:
+            # Two git processes in total, however many files are staged
+            deletions = self._get_staged_deletions(candidates)
+            # Add-only files cannot delete anything: never fetch or parse them
+            old_contents = self._get_old_file_contents(
+                [file_path for file_path in candidates if deletions.get(file_path)]
+            )
+            jobs = [file_path for file_path in candidates if deletions.get(file_path)]
+            args = (
+                jobs,
+                [deletions[file_path] for file_path in jobs],
+                [old_contents.get(file_path) for file_path in jobs],
+            )
+
+            # Parsing is CPU-bound and independent per file, so large
+            # commits fan out across cores
+            if len(jobs) >= PARALLEL_MIN_FILES:
+                with ProcessPoolExecutor() as executor:
+                    results = list(executor.map(self._analyze_file, *args, chunksize=8))
+            else:
+                results = list(map(self._analyze_file, *args))
 
-            self._analyze_file(file_path)
+            for violations in results:
+                self.violations.extend(violations)
 
         return self._report_violations()
 
     def _is_excluded_file(self, file_path: str) -> bool:
         """Check if file should be excluded."""
-        excluded = ['test_', '/tests/', '__init__.py', 'conftest.py']
-        return any(pattern in file_path for pattern in excluded)
+        return _EXCLUDED_RE.search(file_path) is not None
 
-    def _analyze_file(self, file_path: str):
+    def _analyze_file(
+        self, file_path: str, deleted_lines: Set[int], old_blob: Optional[bytes]
+    ) -> List[Tuple[str, SecurityPattern, str]]:
         """Analyze a file for security code deletions."""
+        violations: List[Tuple[str, SecurityPattern, str]] = []
         try:
-            # Get the diff
-            diff_result = subprocess.run(
-                ['git', 'diff', '--cached', '--unified=0', file_path],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-
-            diff_output = diff_result.stdout
-            if not diff_output:
-                return
-
-            # Get the OLD version of the file (before changes)
-            old_content = self._get_old_file_content(file_path)
-            if not old_content:
-                return  # New file, no deletions to check
+            # The OLD version of the file (before changes)
+            if not old_blob:
+                return violations  # New file, no deletions to check
+            old_content = old_blob.decode('utf-8')
+            old_content = old_content.replace('\r\n', '\n').replace('\r', '\n')
 
             # Parse old content for security patterns
             old_lines = old_content.split('\n')
-            security_patterns = self._find_security_patterns(old_lines)
-
-            # Find deleted lines
-            deleted_lines = self._get_deleted_lines(diff_output)
+            security_patterns = self._find_security_patterns(old_content, old_lines)
 
             # Check if any security patterns were deleted
-            for line_num in deleted_lines:
-                if line_num in security_patterns:
-                    for pattern in security_patterns[line_num]:
-                        # Get surrounding context
-                        context_lines = self._get_context_lines(old_lines, line_num)
-
-                        self.violations.append((
-                            file_path,
-                            pattern,
-                            context_lines
-                        ))
-
-        except subprocess.CalledProcessError:
-            pass  # File might be new or untracked
+            for line_num in sorted(deleted_lines & security_patterns.keys()):
+                for pattern in security_patterns[line_num]:
+                    # Get surrounding context
+                    context_lines = self._get_context_lines(old_lines, line_num)
+
+                    violations.append((
+                        file_path,
+                        pattern,
+                        context_lines
+                    ))
+
         except Exception as e:
-            print(f"Warning: Could not analyze {file_path}: {e}")
+            # flush: this may run in a pool worker that exits without it
+            print(f"Warning: Could not analyze {file_path}: {e}", flush=True)
+
+        return violations
 
-    def _get_old_file_content(self, file_path: str) -> Optional[str]:
-        """Get the old version of a file from git."""
+    def _get_staged_deletions(self, file_paths: List[str]) -> Dict[str, Set[int]]:
+        """Deleted line numbers of each file, from one streamed git diff."""
+        try:
+            with subprocess.Popen(
+                # Fixed a/ b/ prefixes whatever diff.noprefix etc. say
+                ['git', 'diff', '--cached', '--unified=0', '--no-color',
+                 '--no-ext-diff', '--src-prefix=a/', '--dst-prefix=b/', '--']
+                + file_paths,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                errors='replace',  # one undecodable file must not sink the rest
+            ) as proc:
+                deleted = _parse_deleted_lines(proc.stdout)
+        except OSError:
+            return {}
+        # Not a repository, or nothing to compare against
+        return deleted if proc.returncode == 0 else {}
+
+    def _get_old_file_contents(self, file_paths: List[str]) -> Dict[str, bytes]:
+        """HEAD version of each file, streamed by a single git cat-file."""
+        if not file_paths:
+            return {}
+        # --batch takes one object name per line
+        file_paths = [file_path for file_path in file_paths if '\n' not in file_path]
+        request = ''.join(f'HEAD:{file_path}\n' for file_path in file_paths)
         try:
             result = subprocess.run(
-                ['git', 'show', f'HEAD:{file_path}'],
+                ['git', 'cat-file', '--batch'],
+                input=request.encode('utf-8'),
                 capture_output=True,
-                text=True,
                 check=True
             )
-            return result.stdout
-        except subprocess.CalledProcessError:
-            return None
+        except (OSError, subprocess.CalledProcessError):
+            return {}
+
+        # Replies come in request order: "<sha> blob <size>\n<content>\n",
+        # or "<name> missing\n" for files that are new since HEAD
+        contents: Dict[str, bytes] = {}
+        out = result.stdout
+        pos = 0
+        for file_path in file_paths:
+            end = out.index(b'\n', pos)
+            header = out[pos:end].split()
+            pos = end + 1
+            if len(header) == 3 and header[1] == b'blob':
+                size = int(header[2])
+                contents[file_path] = out[pos:pos + size]
+                pos += size + 1
+        return contents
+
+    def _find_security_patterns(
+        self, source_code: str, source_lines: List[str]
+    ) -> Dict[int, List[SecurityPattern]]:
+        """Find security patterns, reusing cached results for identical content."""
+        if not PATTERN_CACHE_ENABLED:
+            return self._scan_security_patterns(source_code, source_lines)
+
+        digest = hashlib.sha256()
+        digest.update(_hook_fingerprint())
+        digest.update(source_code.encode())
+        cache_file = PATTERN_CACHE_DIR / f"{digest.hexdigest()}.pkl"
 
-    def _find_security_patterns(self, source_lines: List[str]) -> Dict[int, List[SecurityPattern]]:
+        try:
+            with open(cache_file, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            pass  # missing, or pickled under another module name
+
+        patterns = dict(self._scan_security_patterns(source_code, source_lines))
+        try:
+            PATTERN_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=PATTERN_CACHE_DIR, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(patterns, f, protocol=5)
+            os.replace(tmp, cache_file)  # atomic: readers never see a partial file
+        except OSError:
+            pass  # caching is best-effort
+        return patterns
+
+    def _scan_security_patterns(
+        self, source_code: str, source_lines: List[str]
+    ) -> Dict[int, List[SecurityPattern]]:
         """Find security patterns in source code using AST."""
         try:
-            source_code = '\n'.join(source_lines)
             tree = ast.parse(source_code)
 
             analyzer = SecurityASTAnalyzer(source_lines)
@@ -350,50 +577,22 @@ class SecurityDeletionDetector:
         """Fallback: Find security patterns using regex."""
         patterns: Dict[int, List[SecurityPattern]] = defaultdict(list)
 
-        security_regexes = [
-            (r'log_event|log_execution|log_audit', 'audit_logging', 'high'),
-            (r'raise\s+PermissionError', 'authorization_check', 'critical'),
-            (r'if\s+not\s+.*\.authenticated', 'authentication_check', 'critical'),
-            (r'if\s+.*\.role\s*==', 'authorization_check', 'critical'),
-            (r'@.*limiter|@rate_limit', 'rate_limiting', 'high'),
-            (r'def\s+validate_|def\s+sanitize_', 'input_validation', 'high'),
-            (r'HTTPException', 'error_handling', 'medium'),
-            (r'try:', 'error_handling', 'medium'),
-        ]
-
         for line_num, line in enumerate(source_lines, 1):
-            for regex, pattern_type, severity in security_regexes:
-                if re.search(regex, line):
+            # Most lines match nothing; one combined search rules them out
+            if not _ANY_SECURITY_RE.search(line):
+                continue
+            for regex, pattern_type, severity in SECURITY_REGEXES:
+                if regex.search(line):
                     patterns[line_num].append(SecurityPattern(
                         line_number=line_num,
                         code_snippet=line.strip(),
                         pattern_type=pattern_type,
-                        context=f"Detected via regex: {regex}",
+                        context=f"Detected via regex: {regex.pattern}",
                         severity=severity
                     ))
 
         return patterns
 
-    def _get_deleted_lines(self, diff_output: str) -> Set[int]:
-        """Extract line numbers that were deleted from diff."""
-        deleted_lines = set()
-        current_line = 0
-
-        for line in diff_output.split('\n'):
-            if line.startswith('@@'):
-                # Parse hunk header: @@ -old_start,old_count +new_start,new_count @@
-                match = re.search(r'-(\d+),?(\d+)?', line)
-                if match:
-                    current_line = int(match.group(1))
-            elif line.startswith('-') and not line.startswith('---'):
-                # This is a deleted line
-                deleted_lines.add(current_line)
-                current_line += 1
-            elif not line.startswith('+'):
-                current_line += 1
-
-        return deleted_lines
-
     def _get_context_lines(self, source_lines: List[str], line_num: int, context: int = 3) -> str:
         """Get surrounding context for a line."""
         start = max(0, line_num - context - 1)
@@ -419,8 +618,10 @@ class SecurityDeletionDetector:
             'medium': []
         }
 
+        seen_types: Set[str] = set()
         for file_path, pattern, context in self.violations:
             by_severity[pattern.severity].append((file_path, pattern, context))
+            seen_types.add(pattern.pattern_type)
 
         print("\n" + "=" * 80)
         print("⚠️  SECURITY CODE DELETION DETECTED")
@@ -456,22 +657,10 @@ class SecurityDeletionDetector:
         print("SECURITY IMPLICATIONS:")
         print("=" * 80)
 
-        pattern_types = set(p[1].pattern_type for p in self.violations)
-
-        implications = {
-            'audit_logging': '• Reduced audit trail - security events may go unlogged',
-            'authentication_check': '• Weakened authentication - unauthorized access possible',
-            'authorization_check': '• Bypassed authorization - privilege escalation risk',
-            'input_validation': '• Missing input validation - injection attacks possible',
-            'rate_limiting': '• Removed rate limiting - DoS/brute force attacks easier',
-            'error_handling': '• Poor error handling - information leakage risk',
-            'defensive_check': '• Missing defensive checks - potential crashes/errors'
-        }
-
         print()
-        for pattern_type in pattern_types:
-            if pattern_type in implications:
-                print(implications[pattern_type])
+        for pattern_type, implication in IMPLICATIONS.items():
+            if pattern_type in seen_types:
+                print(implication)
 
         print("\n" + "=" * 80)
         print("REMEDIATION:")
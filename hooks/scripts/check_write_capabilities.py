@@ -12,13 +12,18 @@ It then verifies that corresponding tests exist for these capabilities.
 
 import argparse
 import ast
+import os
 import re
 import sys
 from pathlib import Path
-from typing import List, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
 import subprocess
+from concurrent.futures import ProcessPoolExecutor
 
 
+# New-side start of a unified-diff hunk header
+_HUNK_RE = re.compile(r"^@@ -\S+ \+(\d+)")
+
 # Configuration
 MUTATION_KEYWORDS = {
     "db.add",
@@ -47,6 +52,107 @@ AGENT_STATE_MUTATIONS = [
     r"selected_api\s*=",  # API selection
 ]
 
+# Any one of these in tests/ counts as agent test coverage
+AGENT_TEST_FILES = (
+    "test_agent_update.py",
+    "test_agent_delete.py",
+    "test_agent_auth.py",
+)
+
+# Compiled once at import; the checks run them on every added line
+DB_MUTATION_RE = re.compile("|".join(re.escape(k) for k in MUTATION_KEYWORDS))
+HTTP_MUTATION_REGEXES = tuple(
+    (method, re.compile(rf"@router\.{method}\(")) for method in HTTP_MUTATION_METHODS
+)
+# One alternation: each line is scanned once, and a name matching both
+# patterns is reported once
+MUTATION_FUNCTION_RE = re.compile(
+    "|".join(f"(?:{p})" for p in MUTATION_FUNCTION_PATTERNS)
+)
+AGENT_STATE_REGEXES = tuple(re.compile(p) for p in AGENT_STATE_MUTATIONS)
+
+# Matches a file's raw bytes if any of the above could match one of its
+# lines. Bytes patterns only agree with the str ones on ASCII input.
+_ANY_MUTATION_RE = re.compile("|".join(
+    f"(?:{regex.pattern})"
+    for regex in (
+        DB_MUTATION_RE,
+        *(regex for _, regex in HTTP_MUTATION_REGEXES),
+        MUTATION_FUNCTION_RE,
+        *AGENT_STATE_REGEXES,
+    )
+).encode())
+# Searched over several joined lines, so the gap may not span a newline
+_DEF_NAME_RE = re.compile(r"def[^\S\n]+(\w+)")
+
+# Lines starting (after indentation) with these are not scanned
+_COMMENT_PREFIXES = ("#", '"""', "'''")
+
+
+def _unquote_path(path: str) -> str:
+    """Undo git's C-style quoting of unusual paths in diff headers."""
+    if path.startswith('"'):
+        return ast.literal_eval("b" + path).decode("utf-8")
+    return path
+
+
+def _parse_added_lines(diff_lines: Iterable[str]) -> Dict[str, Set[int]]:
+    """Map each file in a --unified=0 diff to its added (new-side) line numbers."""
+    added: Dict[str, Set[int]] = {}
+    current: Optional[Set[int]] = None
+    in_header = False
+    line_num = 0
+
+    for line in diff_lines:
+        # An added line can itself start with "++", so "+++ " only counts
+        # inside a file header
+        first = line[:1]
+        if first == "+":
+            if in_header:
+                if line.startswith("+++ "):
+                    path = _unquote_path(line[4:].rstrip("\n").rstrip("\t"))
+                    current = added.setdefault(path[2:], set()) if path.startswith("b/") else None
+            elif current is not None:
+                current.add(line_num)
+                line_num += 1
+        elif first == "d":
+            if line.startswith("diff --git "):
+                in_header, current = True, None
+        elif first == "@":
+            in_header = False
+            match = _HUNK_RE.match(line)
+            if match:
+                line_num = int(match.group(1))
+
+    return added
+
+
+def _function_defs(source: str) -> Optional[Dict[int, str]]:
+    """Map the line of every def/async def in `source` to its name (None if unparseable)."""
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return None
+    return {
+        node.lineno: node.name
+        for node in ast.walk(tree)
+        if type(node) is ast.FunctionDef or type(node) is ast.AsyncFunctionDef
+    }
+
+
+class _AllLines:
+    """Every line of a file, for when its diff cannot be read."""
+
+    def __contains__(self, line_num: int) -> bool:
+        return True
+
+
+ALL_LINES = _AllLines()
+
+
+# Below this many files a process pool costs more than it saves
+PARALLEL_MIN_FILES = 5
+
 
 class WriteCapabilityDetector:
     """Detects new write capabilities in staged changes."""
@@ -54,18 +160,40 @@ class WriteCapabilityDetector:
     def __init__(self, files: List[str]):
         self.files = files
         self.violations: List[Tuple[str, str, int]] = []
+        # tests/ is listed and read once per run; coverage answers are memoized
+        self._test_files: Optional[List[Path]] = None
+        self._test_names: Set[str] = set()
+        self._test_blob: Optional[str] = None
+        self._test_blob_loaded = False
+        self._coverage_cache: Dict[Tuple[str, str], bool] = {}
+        # Added lines per file from one batched diff (None = diff each file)
+        self._all_added_lines: Optional[Dict[str, Set[int]]] = None
 
     def run(self) -> int:
         """Run the detector on staged files."""
-        for file_path in self.files:
-            if not file_path.endswith(".py"):
-                continue
-
+        candidates = [
+            file_path
+            for file_path in self.files
             # Skip test files, migrations, and seed data
-            if self._is_excluded_file(file_path):
-                continue
+            if file_path.endswith(".py") and not self._is_excluded_file(file_path)
+        ]
+
+        if candidates:
+            # One git diff for every file instead of one per file
+            self._all_added_lines = self._get_staged_added_lines(candidates)
 
-            self._check_file(file_path)
+            # Files are independent, so large commits fan out across cores
+            if len(candidates) >= PARALLEL_MIN_FILES:
+                # Read tests/ here so workers receive it instead of each
+                # re-reading it
+                self._get_test_blob()
+                with ProcessPoolExecutor() as executor:
+                    results = list(executor.map(self._check_file, candidates, chunksize=8))
+            else:
+                results = list(map(self._check_file, candidates))
+
+            for violations in results:
+                self.violations.extend(violations)
 
         return self._report_violations()
 
@@ -82,48 +210,88 @@ class WriteCapabilityDetector:
         ]
         return any(pattern in file_path for pattern in excluded_patterns)
 
-    def _check_file(self, file_path: str):
+    def _check_file(self, file_path: str) -> List[Tuple[str, str, int]]:
         """Check a single file for new write capabilities."""
         try:
-            with open(file_path, "r") as f:
-                content = f.read()
-                lines = content.split("\n")
-
-            # Get the diff to identify added lines
-            added_lines = self._get_added_lines(file_path)
-
-            # Check for database mutations
-            self._check_db_mutations(file_path, added_lines, lines)
+            with open(file_path, "rb") as f:
+                raw = f.read()
 
-            # Check for HTTP mutation endpoints
-            self._check_http_mutations(file_path, added_lines, lines)
+            # No mutation surface anywhere: nothing to decode, diff or scan
+            if raw.isascii() and not _ANY_MUTATION_RE.search(raw):
+                return []
+            # Universal newlines, as text mode would give
+            content = raw.decode().replace("\r\n", "\n").replace("\r", "\n")
+            lines = content.split("\n")
 
-            # Check for mutation functions
-            self._check_mutation_functions(file_path, added_lines, lines)
+            # Get the diff to identify added lines
+            if self._all_added_lines is not None:
+                added_lines = self._all_added_lines[file_path]
+            else:
+                added_lines = self._get_added_lines(file_path)
 
-            # Check for agent state mutations
-            self._check_agent_mutations(file_path, added_lines, lines)
+            # Check for database mutations, HTTP mutation endpoints,
+            # mutation functions and agent state mutations
+            return self._scan_added_lines(file_path, added_lines, lines)
 
         except Exception as e:
-            print(f"Warning: Could not analyze {file_path}: {e}")
+            # Flushed so output from pool workers is not lost or reordered
+            print(f"Warning: Could not analyze {file_path}: {e}", flush=True)
+            return []
 
-    def _get_added_lines(self, file_path: str) -> Set[int]:
-        """Get line numbers of added lines from git diff."""
+    def _get_staged_added_lines(self, file_paths: List[str]) -> Optional[Dict[str, Set[int]]]:
+        """Added line numbers of each file from a single git diff (None = unavailable)."""
         try:
-            result = subprocess.run(
-                ["git", "diff", "--cached", "--unified=0", file_path],
+            toplevel = subprocess.run(
+                ["git", "rev-parse", "--show-toplevel"],
                 capture_output=True,
                 text=True,
                 check=True,
+            ).stdout.rstrip("\n")
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+        with subprocess.Popen(
+            # Fixed a/ b/ prefixes whatever diff.noprefix etc. say
+            ["git", "diff", "--cached", "--unified=0", "--no-color",
+             "--no-ext-diff", "--src-prefix=a/", "--dst-prefix=b/", "--"]
+            + file_paths,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            errors="replace",  # one undecodable file must not sink the rest
+        ) as proc:
+            by_repo_path = _parse_added_lines(proc.stdout)
+        if proc.returncode != 0:
+            return None  # e.g. a path outside the repository: diff files one by one
+
+        # Diff headers name files relative to the top level; arguments may
+        # be absolute or relative to the current directory
+        toplevel = os.path.realpath(toplevel)
+        added: Dict[str, Set[int]] = {}
+        for file_path in file_paths:
+            directory, name = os.path.split(os.path.abspath(file_path))
+            repo_path = os.path.relpath(
+                os.path.join(os.path.realpath(directory), name), toplevel
             )
+            added[file_path] = by_repo_path.get(Path(repo_path).as_posix(), set())
+        return added
 
-            added_lines = set()
-            current_line = 0
-
-            for line in result.stdout.split("\n"):
+    def _get_added_lines(self, file_path: str) -> Union[Set[int], _AllLines]:
+        """Get line numbers of added lines from git diff."""
+        added_lines = set()
+        current_line = 0
+
+        # Parsed as git writes it; the diff is never held in memory whole
+        with subprocess.Popen(
+            ["git", "diff", "--cached", "--unified=0", file_path],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ) as proc:
+            for line in proc.stdout:
                 # Parse unified diff format: @@ -old_start,old_count +new_start,new_count @@
                 if line.startswith("@@"):
-                    match = re.search(r"\+(\d+)", line)
+                    match = _HUNK_RE.match(line)
                     if match:
                         current_line = int(match.group(1))
                 elif line.startswith("+") and not line.startswith("+++"):
@@ -132,47 +300,70 @@ class WriteCapabilityDetector:
                 elif not line.startswith("-"):
                     current_line += 1
 
-            return added_lines
-        except subprocess.CalledProcessError:
+        if proc.returncode != 0:
             # File might be newly added
-            return set(range(1, 10000))  # Consider all lines as new
-
-    def _check_db_mutations(self, file_path: str, added_lines: Set[int], lines: List[str]):
-        """Check for database mutation operations."""
-        for line_num in added_lines:
-            if line_num > len(lines):
-                continue
-
+            return ALL_LINES  # Consider all lines as new
+
+        return added_lines
+
+    def _scan_added_lines(
+        self, file_path: str, added_lines: Union[Set[int], _AllLines], lines: List[str]
+    ) -> List[Tuple[str, str, int]]:
+        """
+        Run every write-capability check over the added lines in one pass.
+
+        Each line is fetched and comment-checked once. Findings are kept per
+        check and returned in the usual order (database, HTTP, functions,
+        agent) so the report reads the same as before.
+        """
+        db_hits: List[Tuple[str, str, int]] = []
+        http_hits: List[Tuple[str, str, int]] = []
+        function_hits: List[Tuple[str, str, int]] = []
+        agent_hits: List[Tuple[str, str, int]] = []
+
+        # Agent state mutations only matter in the execute node (the
+        # critical mutation path)
+        check_agent = "/agent/" in file_path and "execute.py" in file_path
+
+        # Parsed on the first candidate mutation function, if any
+        function_defs: Optional[Dict[int, str]] = None
+        parsed = False
+
+        # Numbers past the end of the file are dropped once, in C, rather
+        # than per iteration
+        file_lines = range(1, len(lines) + 1)
+        if isinstance(added_lines, _AllLines):
+            line_nums: Iterable[int] = file_lines
+        else:
+            line_nums = sorted(added_lines.intersection(file_lines))
+
+        for line_num in line_nums:
             line = lines[line_num - 1]
-
-            for keyword in MUTATION_KEYWORDS:
-                if keyword in line and not self._is_comment(line):
-                    # Check if there's a corresponding test
-                    if not self._has_test_coverage(file_path, keyword):
-                        self.violations.append(
-                            (
-                                file_path,
-                                f"Database mutation detected: {keyword}",
-                                line_num,
-                            )
-                        )
-
-    def _check_http_mutations(self, file_path: str, added_lines: Set[int], lines: List[str]):
-        """Check for HTTP mutation endpoints."""
-        for line_num in added_lines:
-            if line_num > len(lines):
+            if self._is_comment(line):
                 continue
 
-            line = lines[line_num - 1]
+            # Database mutation operations (each keyword once per line, in
+            # the order they appear)
+            keywords = dict.fromkeys(m.group(0) for m in DB_MUTATION_RE.finditer(line))
+            for keyword in keywords:
+                # Check if there's a corresponding test
+                if not self._has_test_coverage(file_path, keyword):
+                    db_hits.append(
+                        (
+                            file_path,
+                            f"Database mutation detected: {keyword}",
+                            line_num,
+                        )
+                    )
 
-            for method in HTTP_MUTATION_METHODS:
-                pattern = rf"@router\.{method}\("
-                if re.search(pattern, line) and not self._is_comment(line):
+            # HTTP mutation endpoints
+            for method, regex in HTTP_MUTATION_REGEXES:
+                if regex.search(line):
                     # Extract endpoint name from next few lines
                     endpoint_name = self._extract_endpoint_name(lines, line_num)
 
                     if not self._has_test_coverage(file_path, f"{method}_{endpoint_name}"):
-                        self.violations.append(
+                        http_hits.append(
                             (
                                 file_path,
                                 f"HTTP {method.upper()} endpoint detected: {endpoint_name}",
@@ -180,107 +371,105 @@ class WriteCapabilityDetector:
                             )
                         )
 
-    def _check_mutation_functions(self, file_path: str, added_lines: Set[int], lines: List[str]):
-        """Check for functions that likely perform mutations."""
-        for line_num in added_lines:
-            if line_num > len(lines):
-                continue
-
-            line = lines[line_num - 1]
-
-            for pattern in MUTATION_FUNCTION_PATTERNS:
-                match = re.search(pattern, line)
-                if match and not self._is_comment(line):
+            # Functions that likely perform mutations. The regex only
+            # nominates lines; the parsed tree confirms a real def starts
+            # there (not a comment or string) and supplies its name.
+            func_name = None
+            match = MUTATION_FUNCTION_RE.search(line)
+            if match:
+                if not parsed:
+                    function_defs, parsed = _function_defs("\n".join(lines)), True
+                if function_defs is None:
+                    # Unparseable file: trust the regex
                     func_name = match.group(0).replace("def ", "").split("(")[0]
+                else:
+                    name = function_defs.get(line_num)
+                    if name is not None and MUTATION_FUNCTION_RE.match(f"def {name}"):
+                        func_name = name
+
+            if func_name:
+                if not self._has_test_coverage(file_path, func_name):
+                    function_hits.append(
+                        (
+                            file_path,
+                            f"Mutation function detected: {func_name}",
+                            line_num,
+                        )
+                    )
 
-                    if not self._has_test_coverage(file_path, func_name):
-                        self.violations.append(
+            # Agent-specific mutations
+            if check_agent:
+                for regex in AGENT_STATE_REGEXES:
+                    if regex.search(line) and not self._has_agent_test_coverage():
+                        agent_hits.append(
                             (
                                 file_path,
-                                f"Mutation function detected: {func_name}",
+                                "Agent state mutation detected in execute node",
                                 line_num,
                             )
                         )
 
-    def _check_agent_mutations(self, file_path: str, added_lines: Set[int], lines: List[str]):
-        """Check for agent-specific mutations."""
-        if "/agent/" not in file_path:
-            return
-
-        for line_num in added_lines:
-            if line_num > len(lines):
-                continue
-
-            line = lines[line_num - 1]
-
-            for pattern in AGENT_STATE_MUTATIONS:
-                if re.search(pattern, line) and not self._is_comment(line):
-                    # Check if this is in execute.py node (critical mutation path)
-                    if "execute.py" in file_path:
-                        if not self._has_agent_test_coverage():
-                            self.violations.append(
-                                (
-                                    file_path,
-                                    "Agent state mutation detected in execute node",
-                                    line_num,
-                                )
-                            )
+        return db_hits + http_hits + function_hits + agent_hits
 
     def _is_comment(self, line: str) -> bool:
         """Check if line is a comment."""
-        stripped = line.strip()
-        return stripped.startswith("#") or stripped.startswith('"""') or stripped.startswith("'''")
+        return line.lstrip().startswith(_COMMENT_PREFIXES)
 
     def _extract_endpoint_name(self, lines: List[str], start_line: int) -> str:
         """Extract endpoint function name from decorator."""
         # Look at the next few lines for the function definition
-        for i in range(start_line, min(start_line + 5, len(lines))):
-            match = re.search(r"def\s+(\w+)", lines[i])
-            if match:
-                return match.group(1)
-        return "unknown"
+        match = _DEF_NAME_RE.search("\n".join(lines[start_line:start_line + 5]))
+        return match.group(1) if match else "unknown"
 
     def _has_test_coverage(self, file_path: str, capability_name: str) -> bool:
         """Check if tests exist for the given capability."""
-        test_dir = Path("tests")
-        if not test_dir.exists():
-            return False
-
-        # Derive potential test patterns
-        test_patterns = self._get_test_patterns(file_path, capability_name)
-
-        # Search for tests
-        for test_file in test_dir.glob("test_*.py"):
-            try:
-                with open(test_file, "r") as f:
-                    test_content = f.read().lower()
-
-                    # Check if any pattern matches
-                    for pattern in test_patterns:
-                        if pattern.lower() in test_content:
-                            return True
-            except Exception:
-                continue
-
-        return False
+        key = (file_path, capability_name)
+        covered = self._coverage_cache.get(key)
+        if covered is None:
+            test_blob = self._get_test_blob()
+
+            # Derive potential test patterns
+            test_patterns = self._get_test_patterns(file_path, capability_name)
+
+            # Patterns never contain a newline, so none can match across
+            # two files of the joined blob
+            covered = test_blob is not None and any(
+                pattern.lower() in test_blob for pattern in test_patterns
+            )
+            self._coverage_cache[key] = covered
+        return covered
+
+    def _get_test_files(self) -> Optional[List[Path]]:
+        """tests/test_*.py, listed once (None = no tests/)."""
+        if self._test_files is None:
+            test_dir = Path("tests")
+            if not test_dir.exists():
+                return None
+            self._test_files = list(test_dir.glob("test_*.py"))
+            self._test_names = {p.name for p in self._test_files}
+        return self._test_files
+
+    def _get_test_blob(self) -> Optional[str]:
+        """Lowercased text of every tests/test_*.py, read once (None = no tests/)."""
+        if not self._test_blob_loaded:
+            self._test_blob_loaded = True
+            test_files = self._get_test_files()
+            if test_files is not None:
+                contents = []
+                for test_file in test_files:
+                    try:
+                        with open(test_file, "r") as f:
+                            contents.append(f.read().lower())
+                    except Exception:
+                        continue
+                self._test_blob = "\n".join(contents)
+        return self._test_blob
 
     def _has_agent_test_coverage(self) -> bool:
         """Check if agent tests exist."""
-        test_dir = Path("tests")
-        if not test_dir.exists():
+        if self._get_test_files() is None:
             return False
-
-        agent_test_files = [
-            "test_agent_update.py",
-            "test_agent_delete.py",
-            "test_agent_auth.py",
-        ]
-
-        for test_file in agent_test_files:
-            if (test_dir / test_file).exists():
-                return True
-
-        return False
+        return any(name in self._test_names for name in AGENT_TEST_FILES)
 
     def _get_test_patterns(self, file_path: str, capability_name: str) -> List[str]:
         """Generate potential test patterns for a capability."""
@@ -6,13 +6,20 @@ This demonstrates the AST-based detection capabilities.
 """
 
 import ast
+import contextlib
+import io
+import os
+import subprocess
 import tempfile
 from pathlib import Path
 import sys
 
 # Import the hook
 sys.path.insert(0, str(Path(__file__).parent))
-from check_authorization_changes import AuthorizationASTVisitor
+from check_authorization_changes import (
+    AuthorizationASTVisitor,
+    AuthorizationChangeDetector,
+)
 
 
 def test_ast_detection():
@@ -196,6 +203,46 @@ def authorize_action(state: AgentState) -> AgentState:
         return 1
 
 
+def test_unusual_staged_paths():
+    """Test that staged files git quotes or tab-terminates are still checked."""
+
+    print("\n" + "=" * 80)
+    print("Testing Staged Paths With Spaces and Non-ASCII Characters")
+    print("=" * 80)
+
+    code = """
+def authorize_action(state):
+    if state.role == "employee":
+        raise PermissionError("Not authorized")
+"""
+
+    all_passed = True
+
+    for name in ("my auth.py", "café.py"):
+        with tempfile.TemporaryDirectory() as repo:
+            subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+            (Path(repo) / "app").mkdir()
+            (Path(repo) / "app" / name).write_text(code)
+            subprocess.run(["git", "add", "."], cwd=repo, check=True)
+
+            # The hook runs git relative to the current directory
+            cwd = os.getcwd()
+            os.chdir(repo)
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    returncode = AuthorizationChangeDetector([f"app/{name}"]).run()
+            finally:
+                os.chdir(cwd)
+
+        if returncode == 1:
+            print(f"✓ PASS - app/{name} blocked")
+        else:
+            print(f"✗ FAIL - app/{name} passed unchecked")
+            all_passed = False
+
+    return 0 if all_passed else 1
+
+
 def main():
     print("Authorization Hook AST Detection Tests")
     print("=" * 80)
@@ -203,6 +250,7 @@ def main():
 
     result1 = test_ast_detection()
     result2 = test_real_world_example()
+    result3 = test_unusual_staged_paths()
 
     print("\n" + "=" * 80)
     print("Test Summary")
@@ -219,7 +267,7 @@ def main():
     print("  ✓ Accurate line numbers")
     print("  ✓ No false positives from similar text")
 
-    return max(result1, result2)
+    return max(result1, result2, result3)
 
 
 if __name__ == "__main__":
@@ -6,51 +6,59 @@ Demonstrates AST-based detection of removed security controls.
 """
 
 import ast
+import os
 import sys
+from collections import Counter
 from pathlib import Path
 
 # Import the hook
 sys.path.insert(0, str(Path(__file__).parent))
 from check_security_deletions import SecurityASTAnalyzer
 
+# Diagnostics print when run as a script (or with SECURITY_HOOK_VERBOSE=1);
+# collected by pytest, the checks run quietly
+_VERBOSE = os.environ.get("SECURITY_HOOK_VERBOSE") == "1"
+
+
+def _report(*args, **kwargs):
+    if _VERBOSE:
+        print(*args, **kwargs)
 
-def test_security_pattern_detection():
-    """Test that security patterns are correctly identified."""
 
-    test_cases = [
-        # Test 1: Audit logging
-        ("""
+_RAW_TEST_CASES = [
+    # Test 1: Audit logging
+    ("""
 def process_action(data):
     log_event("action_executed", session_id, {"data": data})
     return result
 """, ["audit_logging"]),
 
-        # Test 2: Authentication check
-        ("""
+    # Test 2: Authentication check
+    ("""
 def secure_endpoint(state):
     if not state.authenticated:
         raise PermissionError("Not authenticated")
     return data
 """, ["authentication_check", "authorization_check"]),
 
-        # Test 3: Authorization check
-        ("""
+    # Test 3: Authorization check
+    ("""
 def check_access(state):
     if state.role == "admin":
         return True
     raise PermissionError("Unauthorized")
 """, ["authorization_check"]),
 
-        # Test 4: Input validation function
-        ("""
+    # Test 4: Input validation function
+    ("""
 def validate_user_input(data):
     if not data:
         raise ValueError("Invalid input")
     return sanitized
 """, ["input_validation"]),
 
-        # Test 5: Error handling
-        ("""
+    # Test 5: Error handling
+    ("""
 def safe_operation():
     try:
         risky_operation()
@@ -58,15 +66,15 @@ def safe_operation():
         log_error(e)
 """, ["error_handling"]),
 
-        # Test 6: HTTPException
-        ("""
+    # Test 6: HTTPException
+    ("""
 def api_endpoint(user_id):
     if not user_id:
         raise HTTPException(status_code=400, detail="Missing user_id")
 """, ["error_handling"]),
 
-        # Test 7: Multiple security patterns
-        ("""
+    # Test 7: Multiple security patterns
+    ("""
 def authorize_action(state):
     log_event("authorization_check", state.session_id)
 
@@ -77,63 +85,74 @@ def authorize_action(state):
     if state.role != "admin":
         raise PermissionError("Insufficient privileges")
 """, ["audit_logging", "authentication_check", "authorization_check"]),
-    ]
+]
+
+# Stripped once at import; parsing the stripped text keeps tree line
+# numbers aligned with the split lines
+TEST_CASES = tuple(
+    (code.strip(), tuple(expected)) for code, expected in _RAW_TEST_CASES
+)
 
-    print("Testing Security Pattern Detection")
-    print("=" * 80)
+
+def test_security_pattern_detection():
+    """Test that security patterns are correctly identified."""
+
+    _report("Testing Security Pattern Detection")
+    _report("=" * 80)
 
     all_passed = True
 
-    for i, (code, expected_types) in enumerate(test_cases, 1):
-        print(f"\nTest Case {i}:")
-        print("-" * 40)
-        print(code.strip())
-        print("-" * 40)
+    for i, (code, expected_types) in enumerate(TEST_CASES, 1):
+        _report(f"\nTest Case {i}:")
+        _report("-" * 40)
+        _report(code)
+        _report("-" * 40)
 
         try:
-            lines = code.strip().split('\n')
+            lines = code.split('\n')
             tree = ast.parse(code)
 
             analyzer = SecurityASTAnalyzer(lines)
             analyzer.visit(tree)
 
             # Get all detected pattern types
-            detected_types = set()
-            for patterns in analyzer.security_patterns.values():
-                for pattern in patterns:
-                    detected_types.add(pattern.pattern_type)
+            detected_types = {
+                pattern.pattern_type
+                for patterns in analyzer.security_patterns.values()
+                for pattern in patterns
+            }
 
-            print(f"Expected: {', '.join(expected_types)}")
-            print(f"Detected: {', '.join(detected_types)}")
+            _report(f"Expected: {', '.join(expected_types)}")
+            _report(f"Detected: {', '.join(detected_types)}")
 
             # Check if all expected patterns were found
             expected_set = set(expected_types)
             if expected_set.issubset(detected_types):
-                print("✓ PASS")
+                _report("✓ PASS")
             else:
                 missing = expected_set - detected_types
-                print(f"✗ FAIL - Missing: {missing}")
+                _report(f"✗ FAIL - Missing: {missing}")
                 all_passed = False
 
         except Exception as e:
-            print(f"✗ FAIL - Exception: {e}")
+            _report(f"✗ FAIL - Exception: {e}")
             all_passed = False
 
-    print("\n" + "=" * 80)
+    _report("\n" + "=" * 80)
     if all_passed:
-        print("✓ All tests passed!")
+        _report("✓ All tests passed!")
         return 0
     else:
-        print("✗ Some tests failed")
+        _report("✗ Some tests failed")
         return 1
 
 
 def test_real_world_security_code():
     """Test on actual security code from the project."""
 
-    print("\n" + "=" * 80)
-    print("Testing Real-World Security Code Detection")
-    print("=" * 80)
+    _report("\n" + "=" * 80)
+    _report("Testing Real-World Security Code Detection")
+    _report("=" * 80)
 
     # Simulate code from authorize.py with logging
     code = """
@@ -171,37 +190,37 @@ def authorize_action(state):
 """
 
     try:
-        lines = code.strip().split('\n')
+        code = code.strip()
+        lines = code.split('\n')
         tree = ast.parse(code)
 
         analyzer = SecurityASTAnalyzer(lines)
         analyzer.visit(tree)
 
-        print("\nDetected Security Patterns:")
-        print("-" * 80)
+        _report("\nDetected Security Patterns:")
+        _report("-" * 80)
 
-        pattern_counts = {}
+        pattern_counts = Counter()
         severity_counts = {'critical': 0, 'high': 0, 'medium': 0}
 
         for line_num, patterns in sorted(analyzer.security_patterns.items()):
             for pattern in patterns:
-                pattern_type = pattern.pattern_type
-                pattern_counts[pattern_type] = pattern_counts.get(pattern_type, 0) + 1
+                pattern_counts[pattern.pattern_type] += 1
                 severity_counts[pattern.severity] += 1
 
-                print(f"  Line {line_num}: {pattern.pattern_type} ({pattern.severity})")
-                print(f"    → {pattern.context}")
+                _report(f"  Line {line_num}: {pattern.pattern_type} ({pattern.severity})")
+                _report(f"    → {pattern.context}")
 
-        print("\n" + "-" * 80)
-        print("Summary:")
-        print(f"  Total security patterns: {sum(pattern_counts.values())}")
+        _report("\n" + "-" * 80)
+        _report("Summary:")
+        _report(f"  Total security patterns: {sum(pattern_counts.values())}")
         for pattern_type, count in sorted(pattern_counts.items()):
-            print(f"    {pattern_type}: {count}")
+            _report(f"    {pattern_type}: {count}")
 
-        print(f"\n  By severity:")
+        _report(f"\n  By severity:")
         for severity in ['critical', 'high', 'medium']:
             if severity_counts[severity] > 0:
-                print(f"    {severity.upper()}: {severity_counts[severity]}")
+                _report(f"    {severity.upper()}: {severity_counts[severity]}")
 
         # Verify expected patterns
         expected_patterns = {
@@ -213,16 +232,16 @@ def authorize_action(state):
 
         detected = set(pattern_counts.keys())
 
-        print("\n" + "=" * 80)
+        _report("\n" + "=" * 80)
         if expected_patterns.issubset(detected):
-            print("✓ Successfully detected all expected security patterns!")
+            _report("✓ Successfully detected all expected security patterns!")
             return 0
         else:
-            print(f"✗ Missing patterns: {expected_patterns - detected}")
+            _report(f"✗ Missing patterns: {expected_patterns - detected}")
             return 1
 
     except Exception as e:
-        print(f"✗ Error: {e}")
+        _report(f"✗ Error: {e}")
         import traceback
         traceback.print_exc()
         return 1
@@ -291,4 +310,5 @@ def main():
 
 
 if __name__ == "__main__":
+    _VERBOSE = True
     sys.exit(main())
@@ -1,4 +1,9 @@
-from tests.conftest import chat
+import asyncio
+
+import httpx
+
+from app.main import app
+from tests.conftest import achat, chat
 
 
 def test_hr_login_persists(agent_session):
@@ -11,3 +16,34 @@ def test_hr_login_persists(agent_session):
     r = chat(agent_session, "Show my profile")
     assert "mark jensen" in r["message"].lower()
     assert "role: hr" in r["message"].lower()
+
+
+def test_concurrent_logins_stay_separate():
+    """Three users log in at once; each session sees only its own profile."""
+    users = [
+        ("mark.jensen@company.com", "mark jensen"),
+        ("priya.nair@company.com", "priya nair"),
+        ("alice.hr@company.com", "alice hr"),
+    ]
+
+    async def login_and_view(ac: httpx.AsyncClient, email: str, name: str):
+        response = await ac.post("/agent/session")
+        assert response.status_code == 200
+        session_id = response.json()["session_id"]
+
+        r = await achat(
+            ac, session_id, f"Login with email {email} and access code 123456"
+        )
+        assert "authenticated" in r["message"].lower()
+
+        r = await achat(ac, session_id, "Show my profile")
+        assert name in r["message"].lower()
+
+    async def run_all():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            await asyncio.gather(
+                *(login_and_view(ac, email, name) for email, name in users)
+            )
+
+    asyncio.run(run_all())
@@ -1,5 +1,17 @@
+import re
+
 from tests.conftest import chat
 
+_CONFIRM_OR_DENIED_RE = re.compile(
+    "are you sure"  # HITL path
+    "|permission"  # auth denial
+    "|not authorized",
+    re.IGNORECASE,
+)
+_SELF_DELETE_DENIED_RE = re.compile(
+    "cannot delete your own profile|permission|not authorized", re.IGNORECASE
+)
+
 
 def test_delete_requires_hitl_or_permission(agent_session):
     """
@@ -15,16 +27,7 @@ def test_delete_requires_hitl_or_permission(agent_session):
 
     r = chat(agent_session, "Delete John Miller")
 
-    msg = r["message"].lower()
-
-    assert any(
-        phrase in msg
-        for phrase in [
-            "are you sure",          # HITL path
-            "permission",            # auth denial
-            "not authorized",
-        ]
-    )
+    assert _CONFIRM_OR_DENIED_RE.search(r["message"])
 
 
 def test_hr_cannot_delete_self(agent_session):
@@ -39,12 +42,5 @@ def test_hr_cannot_delete_self(agent_session):
 
     # Step 2: Confirm
     r = chat(agent_session, "Yes")
-    assert any(
-        phrase in r["message"].lower()
-        for phrase in [
-            "cannot delete your own profile",
-            "permission",
-            "not authorized",
-        ]
-    )
+    assert _SELF_DELETE_DENIED_RE.search(r["message"])
 
@@ -0,0 +1,52 @@
+from unittest.mock import AsyncMock, patch
+
+from tests.conftest import chat
+from app.agent.graph import agent_graph
+from app.database import SessionLocal
+from app.models.audit_log import AuditLog
+
+
+def test_chat_turn_persists_audit_events(agent_session):
+    chat(
+        agent_session,
+        "Login with email priya.nair@company.com and access code 123456",
+    )
+
+    db = SessionLocal()
+    try:
+        events = [
+            row.event_type
+            for row in db.query(AuditLog)
+            .filter(AuditLog.session_id == agent_session)
+            .order_by(AuditLog.id)
+        ]
+    finally:
+        db.close()
+
+    assert "intent_classified" in events
+    assert "auth_success" in events
+
+
+def test_failed_turn_persists_error_event(agent_session):
+    with patch.object(
+        agent_graph, "ainvoke", AsyncMock(side_effect=RuntimeError("boom"))
+    ):
+        r = chat(agent_session, "Show my profile")
+
+    assert "something went wrong" in r["message"]
+
+    db = SessionLocal()
+    try:
+        errors = (
+            db.query(AuditLog)
+            .filter(
+                AuditLog.session_id == agent_session,
+                AuditLog.event_type == "error",
+            )
+            .all()
+        )
+    finally:
+        db.close()
+
+    assert len(errors) == 1
+    assert "RuntimeError" in errors[0].details
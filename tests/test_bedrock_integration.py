@@ -0,0 +1,26 @@
+"""
+Live Bedrock check for intent classification.
+
+Calls AWS, so it is marked `integration` and skipped by default.
+Run it with: uv run pytest -m integration tests/test_bedrock_integration.py -s
+"""
+
+import asyncio
+
+import pytest
+
+
+@pytest.mark.integration
+def test_bedrock_classifies_login(monkeypatch):
+    pytest.importorskip("boto3")
+    monkeypatch.setenv("AWS_REGION", "us-east-1")
+
+    from app.agent.llm import classify_intent
+
+    print("Testing Bedrock LLM classification...")
+    result = asyncio.run(
+        classify_intent("Login with email mark.jensen@company.com and access code 123456")
+    )
+    print(f"\n✅ Result: {result}")
+    print(f"✅ Intent: {result.get('intent')}")
+    assert "intent" in result
@@ -0,0 +1,66 @@
+from sqlalchemy import update
+
+from tests.conftest import client
+from app.database import SessionLocal
+from app.models.employee import Employee
+
+
+def test_update_rejects_null_for_required_field():
+    r = client.put("/employee/1", json={"name": None})
+
+    assert r.status_code == 422
+
+
+def test_update_changes_only_given_fields():
+    before = client.get("/employee/2").json()
+
+    r = client.put("/employee/2", json={"location": "London"})
+
+    assert r.status_code == 200
+    assert r.json() == {**before, "location": "London"}
+
+
+def test_update_can_clear_manager():
+    r = client.put("/employee/2", json={"manager_id": None})
+
+    assert r.status_code == 200
+    assert r.json()["manager_id"] is None
+
+
+def _set_managers(managers):
+    db = SessionLocal()
+    try:
+        for emp_id, manager_id in managers.items():
+            db.execute(
+                update(Employee)
+                .where(Employee.id == emp_id)
+                .values(manager_id=manager_id)
+            )
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_reports_include_every_level():
+    # 1 -> 2 -> 3, and 1 -> 4
+    _set_managers({2: 1, 3: 2, 4: 1})
+
+    r = client.get("/employee/1/reports")
+
+    assert r.status_code == 200
+    assert [e["id"] for e in r.json()] == [2, 3, 4]
+
+
+def test_reports_of_leaf_are_empty():
+    _set_managers({2: 1, 3: 2})
+
+    r = client.get("/employee/3/reports")
+
+    assert r.status_code == 200
+    assert r.json() == []
+
+
+def test_reports_of_unknown_employee_is_404():
+    r = client.get("/employee/999/reports")
+
+    assert r.status_code == 404
@@ -0,0 +1,22 @@
+from app.agent import employee_cache
+from app.agent.employee_cache import get_employee_by_email, invalidate_employee
+from app.database import SessionLocal
+from app.models.employee import Employee
+
+
+def test_id_invalidation_drops_email_row_after_id_row_evicted():
+    db = SessionLocal()
+    try:
+        row = get_employee_by_email(db, "priya.nair@company.com")
+
+        # The LRU evicted the id entry but kept the email one
+        with employee_cache._cache_lock:
+            employee_cache._cache.pop(("id", row.id))
+
+        db.get(Employee, row.id).role = "manager"
+        db.commit()
+        invalidate_employee(row.id)
+
+        assert get_employee_by_email(db, "priya.nair@company.com").role == "manager"
+    finally:
+        db.close()
@@ -1,6 +1,6 @@
 
 import pytest
-from tests.utils import chat, create_new_session
+from tests.conftest import chat, create_new_session
 
 # ------------------------------------------------------------
 # Onboarding: happy path
@@ -0,0 +1,29 @@
+import uuid
+
+from sqlalchemy import create_engine, text
+
+from app.database import SCHEMA_VERSION, migrate_sqlite
+
+
+def test_text_session_ids_become_uuid_bytes():
+    # Tables as created before session ids were stored as 16 bytes
+    engine = create_engine("sqlite://")
+    sid = str(uuid.uuid4())
+
+    with engine.begin() as conn:
+        for table in ("agent_sessions", "agent_messages", "audit_log"):
+            conn.execute(text(f"CREATE TABLE {table} (session_id VARCHAR)"))
+            conn.execute(
+                text(f"INSERT INTO {table} VALUES (:sid), ('not-a-uuid')"),
+                {"sid": sid},
+            )
+
+        migrate_sqlite(conn)
+
+    with engine.connect() as conn:
+        for table in ("agent_sessions", "agent_messages", "audit_log"):
+            rows = conn.execute(text(f"SELECT session_id FROM {table}")).scalars()
+            assert sorted(rows, key=str) == sorted(
+                [uuid.UUID(sid).bytes, "not-a-uuid"], key=str
+            )
+        assert conn.execute(text("PRAGMA user_version")).scalar() == SCHEMA_VERSION